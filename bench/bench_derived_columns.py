@@ -0,0 +1,91 @@
+# bench_derived_columns.py
+"""
+add_derived_columns() against the row-wise code it replaced.
+
+Builds a synthetic squad frame from the birth date cells of the saved
+pages in tests/pages and times both on it. The old code only derived
+Birth_Year, a year-difference Age and Goal_Ratio (with df.apply); the
+new one also parses full dates for Birth_Date, an exact Age and Age_Days.
+
+    python bench/bench_derived_columns.py [--rows 1000000]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scraper import add_derived_columns, extract_players_table, normalize_headers  # noqa: E402
+
+PAGES = os.path.join(ROOT, 'tests', 'pages', '*.html')
+
+
+def old_derived_columns(df):
+    """Derived columns as computed before add_derived_columns()"""
+    if 'Date_of_Birth' in df.columns:
+        df['Birth_Year'] = df['Date_of_Birth'].str.extract(r'(\d{4})')
+        df['Birth_Year'] = pd.to_numeric(df['Birth_Year'], errors='coerce')
+        current_year = datetime.now().year
+        df['Age'] = current_year - df['Birth_Year']
+
+    if all(col in df.columns for col in ['Caps', 'Goals']):
+        df['Goal_Ratio'] = df.apply(
+            lambda x: x['Goals'] / x['Caps'] if x['Caps'] > 0 else 0,
+            axis=1
+        )
+    return df
+
+
+def birth_date_cells():
+    cells = []
+    for path in sorted(glob.glob(PAGES)):
+        with open(path, 'rb') as f:
+            header_texts, rows = extract_players_table(f.read(), 'full', 'html.parser')
+        column = normalize_headers(header_texts).index('Date_of_Birth')
+        cells.extend(row[column] for row in rows)
+    return cells
+
+
+def synthetic_squad(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = np.array(birth_date_cells(), dtype=object)
+    caps = rng.integers(0, 120, n).astype('float64')
+    return pd.DataFrame({
+        'Date_of_Birth': cells[rng.integers(0, len(cells), n)],
+        'Caps': caps,
+        'Goals': np.floor(caps * rng.random(n) / 3),
+    })
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df.copy())
+    return result, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    df = synthetic_squad(args.rows)
+    old, old_seconds = timed(old_derived_columns, df)
+    new, new_seconds = timed(add_derived_columns, df)
+
+    print(f"{args.rows:,} rows")
+    print(f"row-wise (old):   {old_seconds:8.2f} s  Birth_Year, Age (years only), Goal_Ratio")
+    print(f"vectorized (new): {new_seconds:8.2f} s  + Birth_Date, exact Age, Age_Days")
+    print(f"speedup: {old_seconds / new_seconds:.1f}x")
+    print('Goal_Ratio equal:', np.allclose(old['Goal_Ratio'], new['Goal_Ratio']))
+    print('Birth_Year equal:', bool((old['Birth_Year'] == new['Birth_Year']).all()))
+
+
+if __name__ == '__main__':
+    main()
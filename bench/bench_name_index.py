@@ -0,0 +1,103 @@
+# bench_name_index.py
+"""
+NameIndex lookups against the str.contains scan the roster search used.
+
+Builds synthetic names from first/last name parts (with accents and
+Arabic script) and times index build, substring, prefix and fuzzy
+lookups against Series.str.contains(case=False) on the same column.
+Substring and prefix results are checked against a scan of the
+normalized names.
+
+    python bench/bench_name_index.py [--names 1000000] [--queries 200]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from name_index import NameIndex, normalize_name  # noqa: E402
+
+FIRST = ['Yassine', 'Achraf', 'Romain', 'Noussair', 'Sofyan', 'Azzedine', 'Hakim', 'Youssef', 'Brahim',
+         'Sadio', 'Kalidou', 'Idrissa', 'Mohamed', 'Riyad', 'Islam', 'Ismaïla', 'Édouard', 'Wahbi',
+         'Ellyes', 'Aïssa', 'محمد', 'أشرف']
+LAST = ['Bounou', 'Ḥakimi', 'Saïss', 'Mazraoui', 'Amrabat', 'Ounahi', 'Ziyech', 'En-Nesyri', 'Díaz',
+        'Mané', 'Koulibaly', 'Gueye', 'Salah', 'Mahrez', 'Slimani', 'Sarr', 'Mendy', 'Khazri',
+        'Skhiri', 'Mandi', 'صلاح', 'حكيمي']
+
+
+def synthetic_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    first = np.array(FIRST, dtype=object)[rng.integers(0, len(FIRST), n)]
+    last = np.array(LAST, dtype=object)[rng.integers(0, len(LAST), n)]
+    number = rng.integers(0, 100_000, n).astype(str)
+    return pd.Series(first + ' ' + last + ' ' + number.astype(object))
+
+
+def queries(names, count, seed=1):
+    """Substrings of random names, some of them typed without accents"""
+    rng = np.random.default_rng(seed)
+    result = []
+    for name in names.sample(count, random_state=seed):
+        start = int(rng.integers(0, max(1, len(name) - 4)))
+        result.append(name[start:start + int(rng.integers(3, 9))])
+    return result
+
+
+def median_ms(func, items):
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, max(timings) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--names', type=int, default=1_000_000)
+    arg_parser.add_argument('--queries', type=int, default=200)
+    arg_parser.add_argument('--scan-queries', type=int, default=10, help='str.contains is slow; time fewer')
+    args = arg_parser.parse_args()
+
+    names = synthetic_names(args.names)
+    start = time.perf_counter()
+    index = NameIndex(names)
+    build_seconds = time.perf_counter() - start
+
+    lookups = queries(names, args.queries)
+    typos = [q[:-2] + q[-1] + q[-2] for q in lookups if len(q) > 4]
+    print(f"{args.names:,} names, index built in {build_seconds:.1f} s")
+    print(f"{'lookup':<28} {'median ms':>10} {'max ms':>10}")
+    rows = [
+        ('str.contains(case=False)', lambda q: names.str.contains(re.escape(q), case=False, na=False),
+         lookups[:args.scan_queries]),
+        ('NameIndex.substring', index.substring, lookups),
+        ('NameIndex.prefix', index.prefix, lookups),
+        ('NameIndex.fuzzy (typos)', index.fuzzy, typos),
+    ]
+    for label, func, items in rows:
+        median, worst = median_ms(func, items)
+        print(f"{label:<28} {median:>10.1f} {worst:>10.1f}")
+
+    normalized = names.map(normalize_name)
+    padded = ' ' + normalized + ' '
+    mismatches = 0
+    for q in lookups[:args.scan_queries]:
+        text = normalize_name(q)
+        expected_substring = np.flatnonzero(normalized.str.contains(text, regex=False))
+        expected_prefix = np.flatnonzero(padded.str.contains(' ' + text, regex=False))
+        mismatches += not np.array_equal(index.substring(q), expected_substring)
+        mismatches += not np.array_equal(index.prefix(q), expected_prefix)
+    print(f"results matching a normalized scan: {2 * args.scan_queries - mismatches}/{2 * args.scan_queries}")
+
+
+if __name__ == '__main__':
+    main()
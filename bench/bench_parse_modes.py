@@ -0,0 +1,86 @@
+# bench_parse_modes.py
+"""
+Time and peak memory of locating and reading the squad table in each
+parse mode (extract_players_table(), i.e. everything before the
+DataFrame is built).
+
+Runs on the saved pages in tests/pages, plus each page padded with
+link-heavy article text to roughly the size of a live Wikipedia team
+page, and checks that every mode gives the same frame as 'full'.
+
+    python bench/bench_parse_modes.py [--parser html.parser] [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scraper import (PARSE_MODES, clear_table_signatures, extract_players_table,  # noqa: E402
+                     rows_to_dataframe)
+
+PAGES = os.path.join(ROOT, 'tests', 'pages', '*.html')
+FILLER = (b'<p>' + b'Prose with <a href="/wiki/Link" title="Link">a link</a> and a note'
+          b'<sup class="reference"><a href="#cite_note-1">[1]</a></sup>. ' * 12 + b'</p>')
+
+
+def load_pages(target_size):
+    pages = {}
+    for path in sorted(glob.glob(PAGES)):
+        name = os.path.basename(path)[:-len('.html')].replace('_national_football_team', '')
+        with open(path, 'rb') as f:
+            content = f.read()
+        pages[name] = content
+        # Pad the article text on both sides of the squad section
+        repeat = max(0, (target_size - len(content)) // (2 * len(FILLER)))
+        head, sep, tail = content.partition(b'<div class="mw-parser-output">')
+        if sep:
+            pages[name + ' (large)'] = head + sep + FILLER * repeat + tail.replace(
+                b'</div></body>', FILLER * repeat + b'</div></body>', 1)
+    return pages
+
+
+def measure(content, parse_mode, parser, repeat):
+    timings = []
+    for _ in range(repeat):
+        clear_table_signatures()
+        start = time.perf_counter()
+        table = extract_players_table(content, parse_mode, parser)
+        timings.append(time.perf_counter() - start)
+
+    clear_table_signatures()
+    tracemalloc.start()
+    extract_players_table(content, parse_mode, parser)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    df = rows_to_dataframe(*table) if table else None
+    return df, statistics.median(timings), peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--parser', default='html.parser')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--size', type=int, default=200_000, help='bytes of the padded pages')
+    args = arg_parser.parse_args()
+
+    print(f"parser: {args.parser}, median of {args.repeat} runs")
+    print(f"{'page':<20} {'KB':>6} {'mode':<9} {'ms':>8} {'peak MB':>8} {'speedup':>8}  same")
+    for name, content in load_pages(args.size).items():
+        reference = None
+        for parse_mode in PARSE_MODES:
+            df, seconds, peak = measure(content, parse_mode, args.parser, args.repeat)
+            if reference is None:
+                reference = (df, seconds)
+            same = df is not None and df.equals(reference[0])
+            print(f"{name:<20} {len(content) / 1024:>6.0f} {parse_mode:<9} {seconds * 1000:>8.1f} "
+                  f"{peak / 2**20:>8.1f} {reference[1] / seconds:>7.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
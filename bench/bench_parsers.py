@@ -0,0 +1,64 @@
+# bench_parsers.py
+"""
+Parse time of parse_players_table() per parser backend and parse mode.
+
+Runs on the saved pages in tests/pages and reports the median time per
+page, summed over all pages, and whether each backend gives the same
+frame as html.parser in 'full' mode.
+
+    python bench/bench_parsers.py [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scraper import (PARSE_MODES, available_parsers, clear_table_signatures,  # noqa: E402
+                     parse_players_table, resolve_parser)
+
+PAGES = os.path.join(ROOT, 'tests', 'pages', '*.html')
+
+
+def median_time(content, parse_mode, parser, repeat):
+    timings = []
+    for _ in range(repeat):
+        clear_table_signatures()
+        start = time.perf_counter()
+        df = parse_players_table(content, parse_mode, parser)
+        timings.append(time.perf_counter() - start)
+    return df, statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(PAGES)):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    references = [parse_players_table(content, 'full', 'html.parser') for content in pages]
+
+    print(f"{len(pages)} pages, median of {args.repeat} runs, 'auto' = {resolve_parser('auto')}")
+    print(f"{'parser':<12} " + ' '.join(f"{mode + ' ms':>12}" for mode in PARSE_MODES) + '  same')
+    for parser in available_parsers():
+        totals = []
+        same = True
+        for parse_mode in PARSE_MODES:
+            total = 0
+            for content, reference in zip(pages, references):
+                df, seconds = median_time(content, parse_mode, parser, args.repeat)
+                total += seconds
+                same = same and df.equals(reference)
+            totals.append(total)
+        print(f"{parser:<12} " + ' '.join(f"{total * 1000:>12.1f}" for total in totals) + f"  {same}")
+
+
+if __name__ == '__main__':
+    main()
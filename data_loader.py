@@ -0,0 +1,385 @@
+# data_loader.py
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+# What StaleWhileRevalidate.get() returns; `version` goes up by one every
+# time a new value is swapped in
+LoadedData = namedtuple('LoadedData', ['value', 'timestamp', 'version'])
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key runs the function; everyone arriving while
+    it is in flight waits and gets the same result (or exception). Once
+    the call finishes the key is free again. `stats` counts calls that ran
+    ('executed') and calls that were served by another caller ('shared').
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'executed': 0, 'shared': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['executed'] += 1
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# Process-wide single-flight for scrapes, keyed by page URL
+scrape_flight = SingleFlight()
+
+
+class StaleWhileRevalidate:
+    """
+    Serve the last good value at once and refresh it in the background.
+
+    `fetch()` returns a new (value, timestamp) pair or raises. `initial()`,
+    if given, provides the first (value, timestamp) without fetching, e.g.
+    from a local snapshot; when it returns None or raises, the first get()
+    fetches instead. Once the value is older than
+    `ttl` seconds, get() still returns it but starts one background
+    refresh. A successful refresh replaces the value atomically; a failed
+    one keeps the old value, is recorded in `status()` and is retried no
+    sooner than `retry_after` seconds later. The same holds while there is
+    no value at all: get() returns a None value during that time instead
+    of fetching; refresh() always fetches.
+
+    Fetches go through `flight` (a SingleFlight) under `key`, so manual
+    refreshes, the background refresh and first loads from many threads
+    all share one fetch.
+
+    Every new value gets a new `version`. Caches of data derived from the
+    value should be keyed by it; callbacks registered with
+    on_new_version() are told when a version is superseded.
+    """
+
+    def __init__(self, fetch, ttl, initial=None, retry_after=60, flight=None, key='fetch'):
+        self._fetch = fetch
+        self._flight = flight or SingleFlight()
+        self._key = key
+        self._initial = initial
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._first_load_lock = threading.Lock()
+        self._first_loads = 0
+        self._value = None
+        self._timestamp = None
+        self._seeded = False
+        self._refresh_thread = None
+        self._last_attempt = None
+        self._last_success = None
+        self._last_error = None
+        self.version = 0
+        self._listeners = []
+
+    def on_new_version(self, callback):
+        """Call `callback(version)` whenever a new value is swapped in"""
+        self._listeners.append(callback)
+
+    def get(self):
+        """Return LoadedData(value, timestamp, version); value is None if nothing could be loaded"""
+        new_version = None
+        with self._lock:
+            if not self._seeded:
+                self._seeded = True
+                if self._initial is not None:
+                    # A seed that can't be loaded just means a cold fetch
+                    try:
+                        seed = self._initial()
+                    except Exception as e:
+                        seed = None
+                        self._last_error = _error_text(e)
+                    if seed is not None:
+                        new_version = self._swap(*seed)
+
+            if self._value is not None:
+                if self._is_stale() and not self.refreshing and not self._backing_off():
+                    self._last_attempt = datetime.now()
+                    self._refresh_thread = threading.Thread(
+                        target=self._background_refresh, name="swr-refresh", daemon=True
+                    )
+                    self._refresh_thread.start()
+                loaded = LoadedData(self._value, self._timestamp, self.version)
+            else:
+                loaded = None
+                first_loads = self._first_loads
+
+        self._notify(new_version)
+        if loaded is not None:
+            return loaded
+
+        # The last attempt failed moments ago: report that rather than
+        # blocking this caller on another fetch
+        with self._lock:
+            if self._value is None and self._backing_off():
+                return LoadedData(None, None, self.version)
+
+        # Nothing to serve yet: one caller fetches while the others wait
+        # and are served its outcome. Checking the attempt count seen above
+        # (not just the value) keeps a caller that was descheduled here from
+        # starting a second fetch once the first one has finished.
+        with self._first_load_lock:
+            with self._lock:
+                loaded_meanwhile = self._value is not None or self._first_loads != first_loads
+            if not loaded_meanwhile:
+                self.refresh()
+                with self._lock:
+                    self._first_loads += 1
+        with self._lock:
+            return LoadedData(self._value, self._timestamp, self.version)
+
+    def refresh(self):
+        """Fetch now, in the caller's thread; returns True on success"""
+        with self._lock:
+            self._last_attempt = datetime.now()
+        result, error = self._call_fetch()
+        with self._lock:
+            new_version = self._record(result, error)
+        self._notify(new_version)
+        return error is None
+
+    @property
+    def refreshing(self):
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+
+    def status(self):
+        """State of the loader for display: age, refresh state, last error"""
+        with self._lock:
+            age = (datetime.now() - self._timestamp).total_seconds() if self._timestamp else None
+            if self.refreshing:
+                state = 'refreshing'
+            elif self._last_error is not None:
+                state = 'failed'
+            elif self._value is None:
+                state = 'empty'
+            else:
+                state = 'stale' if self._is_stale() else 'fresh'
+            return {
+                'state': state,
+                'age_seconds': age,
+                'last_attempt': self._last_attempt,
+                'last_success': self._last_success,
+                'last_error': self._last_error,
+            }
+
+    def _is_stale(self):
+        return self._timestamp is None or (datetime.now() - self._timestamp).total_seconds() > self.ttl
+
+    def _backing_off(self):
+        if self._last_error is None or self._last_attempt is None:
+            return False
+        return (datetime.now() - self._last_attempt).total_seconds() < self.retry_after
+
+    def _background_refresh(self):
+        # Fetch outside the lock so readers keep getting the old value
+        result, error = self._call_fetch()
+        with self._lock:
+            new_version = self._record(result, error)
+        self._notify(new_version)
+
+    def _call_fetch(self):
+        try:
+            return self._flight.do(self._key, self._fetch), None
+        except Exception as e:
+            return None, _error_text(e)
+
+    def _record(self, result, error):
+        """Store a fetch outcome; returns the new version if the value changed"""
+        if error is not None:
+            self._last_error = error
+            return None
+        self._last_success = datetime.now()
+        self._last_error = None
+        # Callers that shared one fetch all record the same result
+        if result[0] is self._value:
+            return None
+        return self._swap(*result)
+
+    def _swap(self, value, timestamp):
+        self._value, self._timestamp = value, timestamp
+        self.version += 1
+        return self.version
+
+    def _notify(self, version):
+        if version is None:
+            return
+        for callback in list(self._listeners):
+            callback(version)
+
+
+_MISSING = object()
+
+
+def _error_text(e):
+    return f"{e.__class__.__name__}: {e}" if str(e) else e.__class__.__name__
+
+
+class VersionedCache:
+    """
+    Values derived from one version of a dataset.
+
+    Entries are stored per dataset version; evict_before() drops everything
+    computed from older versions while leaving current ones alone, so a
+    data refresh never throws away unrelated caches. Concurrent misses on
+    the same (version, key) share one compute() call, so sessions arriving
+    together on a new version don't each build the same large index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._flight = SingleFlight()
+
+    def get_or_compute(self, version, key, compute):
+        value = self._lookup(version, key)
+        if value is not _MISSING:
+            return value
+        return self._flight.do((version, key), self._compute, version, key, compute)
+
+    def _compute(self, version, key, compute):
+        # The value is stored before the flight ends, so a caller that just
+        # missed the previous flight finds it here instead of recomputing
+        value = self._lookup(version, key)
+        if value is _MISSING:
+            value = compute()
+            with self._lock:
+                self._entries.setdefault(version, {})[key] = value
+        return value
+
+    def _lookup(self, version, key):
+        with self._lock:
+            return self._entries.get(version, {}).get(key, _MISSING)
+
+    def evict_before(self, version):
+        """Drop every entry derived from a version older than `version`"""
+        with self._lock:
+            for old_version in [v for v in self._entries if v < version]:
+                del self._entries[old_version]
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
+
+
+class RateLimiter:
+    """Allow an action at most once every `interval` seconds"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last = None
+
+    def try_acquire(self):
+        """Return (allowed, seconds until the next call would be allowed)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._last is not None and now - self._last < self.interval:
+                return False, self.interval - (now - self._last)
+            self._last = now
+            return True, 0
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count and size.
+
+    `sizeof(value)` gives an entry's size in bytes (default 0, so only
+    `max_entries` applies); the least recently used entries are evicted
+    until both limits hold again. `stats` counts hits, misses and
+    evictions for display.
+
+    `version_of(key)` gives the data version an entry was derived from
+    (default: the key's first item) so evict_before() can drop entries of
+    superseded versions, like VersionedCache.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, sizeof=None, version_of=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._version_of = version_of or (lambda key: key[0])
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key][0]
+            self.stats['misses'] += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def evict_before(self, version):
+        """Drop every entry derived from a version older than `version`"""
+        with self._lock:
+            for key in [key for key in self._entries if self._version_of(key) < version]:
+                self.bytes -= self._entries.pop(key)[1]
+                self.stats['evictions'] += 1
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,79 @@
+# exports.py
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from snapshot_store import COMPRESSION
+
+# Rows serialized at a time; bounds peak memory on large multi-team frames
+EXPORT_CHUNK_ROWS = 50_000
+
+EXPORT_FORMATS = {
+    'csv': {'label': 'CSV', 'extension': 'csv', 'mime': 'text/csv'},
+    'csv.gz': {'label': 'CSV (gzip)', 'extension': 'csv.gz', 'mime': 'application/gzip'},
+    'json': {'label': 'JSON', 'extension': 'json', 'mime': 'application/json'},
+    'parquet': {'label': 'Parquet', 'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+
+def write_export(df, fmt, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Serialize `df` as `fmt` into the binary file object `out`, chunk by chunk.
+
+    Only one chunk of rows is ever held in serialized form, so the output
+    can go straight to disk for frames too large to render in memory at once.
+    The result is identical to serializing the whole frame in one go.
+    """
+    if fmt == 'csv':
+        _write_csv(df, out, chunk_rows)
+    elif fmt == 'csv.gz':
+        # mtime=0 keeps the bytes identical for identical data
+        with gzip.GzipFile(fileobj=out, mode='wb', mtime=0) as gz:
+            _write_csv(df, gz, chunk_rows)
+    elif fmt == 'json':
+        _write_json(df, out, chunk_rows)
+    elif fmt == 'parquet':
+        _write_parquet(df, out, chunk_rows)
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+def export_bytes(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Return `df` serialized as `fmt`"""
+    out = io.BytesIO()
+    write_export(df, fmt, out, chunk_rows)
+    return out.getvalue()
+
+
+def iter_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, out, chunk_rows):
+    out.write(df.iloc[:0].to_csv(index=False).encode('utf-8'))
+    for chunk in iter_chunks(df, chunk_rows):
+        out.write(chunk.to_csv(index=False, header=False).encode('utf-8'))
+
+
+def _write_json(df, out, chunk_rows):
+    # Same layout as df.to_json(orient='records', indent=2), one chunk at a time
+    if not len(df):
+        out.write(df.to_json(orient='records', indent=2).encode('utf-8'))
+        return
+    out.write(b'[\n')
+    for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+        if i:
+            out.write(b',\n')
+        records = chunk.to_json(orient='records', indent=2)
+        out.write(records[1:-1].strip('\n').encode('utf-8'))
+    out.write(b'\n]')
+
+
+def _write_parquet(df, out, chunk_rows):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema, compression=COMPRESSION) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
@@ -0,0 +1,78 @@
+# filter_index.py
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """
+    Precomputed indexes for answering dashboard filters on one DataFrame.
+
+    Each categorical column gets one packed bitmap per value, and each
+    numeric column a sorted copy of its values with the matching row
+    positions. A query is answered with binary searches and bitmap ANDs
+    and returns the matching row positions, so the frame itself is only
+    touched once, by the caller's df.take(rows). Rows with a missing value
+    never match a filter on that column, like Series.between / isin.
+    """
+
+    def __init__(self, df, categorical=('Position',), numeric=('Caps', 'Goals', 'Age')):
+        self.n_rows = len(df)
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._none = np.zeros_like(self._all)
+
+        self._bitmaps = {}
+        for col in categorical:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            self._bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+
+        self._sorted = {}
+        for col in numeric:
+            if col not in df.columns:
+                continue
+            values = df[col]
+            present = np.flatnonzero(values.notna().to_numpy())
+            present_values = values.to_numpy(dtype='float64', na_value=np.nan)[present]
+            order = np.argsort(present_values, kind='stable')
+            self._sorted[col] = (present_values[order], present[order])
+
+    @property
+    def columns(self):
+        return list(self._bitmaps) + list(self._sorted)
+
+    def query(self, values=None, ranges=None):
+        """
+        Row positions matching every filter, in ascending order.
+
+        `values` maps a categorical column to the allowed values (an empty
+        or missing entry means no filter); `ranges` maps a numeric column
+        to an inclusive (low, high) pair. Filters on columns the index
+        doesn't know are ignored.
+        """
+        bitmap = self._all
+        for col, allowed in (values or {}).items():
+            if col in self._bitmaps and allowed:
+                bitmap = bitmap & self._values_bitmap(col, allowed)
+        for col, (low, high) in (ranges or {}).items():
+            if col in self._sorted:
+                bitmap = bitmap & self._range_bitmap(col, low, high)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def _values_bitmap(self, col, allowed):
+        bitmaps = self._bitmaps[col]
+        result = self._none
+        for value in allowed:
+            if value in bitmaps:
+                result = result | bitmaps[value]
+        return result
+
+    def _range_bitmap(self, col, low, high):
+        sorted_values, positions = self._sorted[col]
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[positions[start:stop]] = True
+        return np.packbits(mask)
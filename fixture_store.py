@@ -0,0 +1,89 @@
+# fixture_store.py
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_MODE_ENV = 'SCRAPER_FIXTURE_MODE'
+FIXTURE_DIR_ENV = 'SCRAPER_FIXTURE_DIR'
+FIXTURE_MODES = ('off', 'record', 'replay')
+DEFAULT_FIXTURE_DIR = 'fixtures'
+
+
+class FixtureNotFoundError(LookupError):
+    """Raised in replay mode when no response was recorded for a URL"""
+
+
+class FixtureStore:
+    """
+    Local store of raw HTTP responses for offline scraping.
+
+    In 'record' mode every successful response is saved (body plus status
+    and headers); in 'replay' mode responses are served from the store and
+    the network is never touched.
+    """
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR, mode='replay'):
+        if mode not in FIXTURE_MODES:
+            raise ValueError(f"Unknown fixture mode: {mode!r}")
+        self.fixture_dir = fixture_dir
+        self.mode = mode
+
+    @classmethod
+    def from_env(cls):
+        """Build a store from SCRAPER_FIXTURE_MODE / SCRAPER_FIXTURE_DIR, or None when off"""
+        mode = os.environ.get(FIXTURE_MODE_ENV, 'off').strip().lower() or 'off'
+        if mode == 'off':
+            return None
+        return cls(os.environ.get(FIXTURE_DIR_ENV, DEFAULT_FIXTURE_DIR), mode)
+
+    @property
+    def recording(self):
+        return self.mode == 'record'
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    def _path(self, url, suffix):
+        # Readable name for reviewing fixtures, hash suffix to keep it unique
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', url.split('://', 1)[-1])[:100]
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.fixture_dir, f"{name}-{digest}{suffix}")
+
+    def save(self, url, response):
+        """Record a response for `url`"""
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        meta = {
+            'url': url,
+            'status_code': response.status_code,
+            # The body is stored decoded, so drop transfer-level headers
+            'headers': {name: value for name, value in response.headers.items()
+                        if name.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')},
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(self._path(url, '.body'), 'wb') as f:
+            f.write(response.content)
+        with open(self._path(url, '.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+
+    def load(self, url):
+        """Return the recorded response for `url` as a requests.Response"""
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._path(url, '.body'), 'rb') as f:
+                content = f.read()
+        except OSError:
+            raise FixtureNotFoundError(f"No recorded response for {url} in {self.fixture_dir}")
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = meta['status_code']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response._content = content
+        return response
@@ -0,0 +1,111 @@
+# http_cache.py
+import hashlib
+import json
+import os
+import threading
+
+
+class HttpCache:
+    """
+    On-disk cache of page bodies keyed by URL.
+
+    Each entry keeps the response bytes together with the ETag and
+    Last-Modified validators so the next fetch can be sent as a
+    conditional GET. The players table extracted from the body is stored
+    next to it so a 304 Not Modified answer skips both the download and
+    the HTML parse. Only the raw cell texts are kept, never a DataFrame:
+    derived columns such as Age depend on the current date and dtypes on
+    the code version, so the frame is rebuilt from the rows on every hit.
+    """
+
+    def __init__(self, cache_dir='.http_cache'):
+        self.cache_dir = cache_dir
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def count(self, name):
+        """Increment one of the hit/miss/not_modified counters"""
+        with self._lock:
+            self.stats[name] += 1
+
+    def load(self, url):
+        """Return the cached entry for `url` or None"""
+        try:
+            with open(self._path(url, '.json'), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(self._path(url, '.body'), 'rb') as f:
+                entry['content'] = f.read()
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers for an entry"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """Save a 200 response; the previously parsed frame is dropped"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+        self.discard_parsed(url)
+        if not etag and not last_modified:
+            # Nothing to revalidate with, so forget any older entry
+            self._remove(url, '.json', '.body')
+            return
+
+        self._write_atomic(self._path(url, '.body'), response.content)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+        self._write_atomic(self._path(url, '.json'), json.dumps(meta).encode('utf-8'))
+
+    def load_parsed(self, url, version=None):
+        """
+        Return the (header_texts, rows) table extracted from the cached
+        body, or None if there is none or it was stored under another
+        `version` of the extraction code.
+        """
+        try:
+            with open(self._path(url, '.rows.json'), 'r', encoding='utf-8') as f:
+                parsed = json.load(f)
+            if parsed['version'] != version:
+                return None
+            return parsed['header_texts'], parsed['rows']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store_parsed(self, url, table, version=None):
+        """Keep the extracted (header_texts, rows) table so a 304 can skip parsing"""
+        if table is None or not os.path.exists(self._path(url, '.json')):
+            return
+        header_texts, rows = table
+        parsed = {'version': version, 'header_texts': header_texts, 'rows': rows}
+        self._write_atomic(self._path(url, '.rows.json'), json.dumps(parsed).encode('utf-8'))
+
+    def discard_parsed(self, url):
+        # .pkl: DataFrames pickled by older versions
+        self._remove(url, '.rows.json', '.pkl')
+
+    def _remove(self, url, *suffixes):
+        for suffix in suffixes:
+            try:
+                os.remove(self._path(url, suffix))
+            except OSError:
+                pass
@@ -0,0 +1,154 @@
+# leaderboard.py
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# A ranking orders rows by `column`, descending; rows where any column in
+# `min_values` is below its minimum (or missing) don't take part
+Ranking = namedtuple('Ranking', ['column', 'min_values'], defaults=[None])
+
+SQUAD_RANKINGS = {
+    'top_scorers': Ranking('Goals'),
+    'most_caps': Ranking('Caps'),
+    'best_ratio': Ranking('Goal_Ratio', {'Caps': 5}),
+}
+
+GROUP_COLUMNS = ('Position', 'Club', 'Team')
+
+
+def ranking_scores(df, ranking):
+    """Scores for one ranking as float64; NaN for rows that don't take part"""
+    scores = df[ranking.column].to_numpy(dtype='float64', na_value=np.nan)
+    for col, minimum in (ranking.min_values or {}).items():
+        values = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        scores[~(values >= minimum)] = np.nan
+    return scores
+
+
+def top_k_positions(scores, k, rows=None):
+    """
+    Positions of the `k` highest scores among `rows` (default: all), best first.
+
+    np.argpartition-style selection: one partition finds the k-th best
+    score, only rows at or above it are sorted. Ties go to the earlier
+    row, as with DataFrame.nlargest(keep='first').
+    """
+    rows = np.arange(len(scores)) if rows is None else rows
+    rows = rows[~np.isnan(scores[rows])]
+    if k <= 0:
+        return rows[:0]
+    if len(rows) > k:
+        values = scores[rows]
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = rows[values > kth]
+        tied = rows[values == kth][:k - len(above)]
+        rows = np.concatenate([above, tied])
+    return rows[np.lexsort((rows, -scores[rows]))]
+
+
+def top_k_indexer(df, rankings=None, k=5, by=None):
+    """
+    Row positions of every ranking's top `k`.
+
+    Returns {name: positions}, or with `by` a column name
+    {name: {group: positions}} for each non-empty group. Rankings whose
+    columns are missing from `df` are skipped.
+    """
+    rankings = SQUAD_RANKINGS if rankings is None else rankings
+    available = {
+        name: ranking for name, ranking in rankings.items()
+        if ranking.column in df.columns and all(col in df.columns for col in ranking.min_values or {})
+    }
+    if by is None:
+        return {name: top_k_positions(ranking_scores(df, ranking), k) for name, ranking in available.items()}
+
+    # Rows of each group, found once and shared by all rankings
+    codes, groups = pd.factorize(df[by])
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    group_rows = [(groups[i], order[bounds[i]:bounds[i + 1]]) for i in range(len(groups))]
+
+    result = {}
+    for name, ranking in available.items():
+        scores = ranking_scores(df, ranking)
+        result[name] = {}
+        for group, rows in group_rows:
+            top = top_k_positions(scores, k, rows)
+            if len(top):
+                result[name][group] = top
+    return result
+
+
+def top_k(df, rankings=None, k=5, by=None):
+    """Like top_k_indexer() but returns the rows themselves as DataFrames"""
+    positions = top_k_indexer(df, rankings, k, by)
+    if by is None:
+        return {name: df.take(rows) for name, rows in positions.items()}
+    return {name: {group: df.take(rows) for group, rows in groups.items()}
+            for name, groups in positions.items()}
+
+
+class Leaderboard:
+    """
+    Rankings across many teams, updated one team at a time.
+
+    For each team only its candidate rows are kept: those in one of the
+    team's own top-k lists, overall or within a group. Any top-k list of
+    all teams together is contained in the union of the candidates, so
+    refreshing one team re-ranks just its rows plus the other teams'
+    small candidate sets instead of every player.
+
+    Ties are broken as top_k() does on the combined frame with the teams
+    one after another: by team order, then row order within the team.
+    Team order is `team_order` if given, otherwise the order teams were
+    first added in; updating, or removing and re-adding, a team doesn't
+    move it.
+    """
+
+    def __init__(self, rankings=None, k=5, group_by=GROUP_COLUMNS, team_order=()):
+        self.rankings = SQUAD_RANKINGS if rankings is None else rankings
+        self.k = k
+        self.group_by = group_by
+        self._candidates = {}
+        self._team_rank = {team: rank for rank, team in enumerate(team_order)}
+        self._frame = None
+
+    @property
+    def teams(self):
+        return list(self._candidates)
+
+    def update(self, df):
+        """Replace the rows of every team in `df`, which needs a Team column"""
+        for team, team_df in df.groupby('Team', sort=False, observed=True):
+            self.update_team(team, team_df)
+
+    def update_team(self, team, df):
+        """Replace the rows of one team"""
+        selected = [rows for rows in top_k_indexer(df, self.rankings, self.k).values()]
+        for by in self.group_by:
+            if by in df.columns:
+                for groups in top_k_indexer(df, self.rankings, self.k, by).values():
+                    selected.extend(groups.values())
+
+        rows = np.unique(np.concatenate(selected)) if selected else np.array([], dtype=np.int64)
+        candidates = df.take(rows)
+        if 'Team' not in candidates.columns:
+            candidates = candidates.assign(Team=team)
+        self._candidates[team] = candidates
+        self._team_rank.setdefault(team, len(self._team_rank))
+        self._frame = None
+
+    def remove_team(self, team):
+        self._candidates.pop(team, None)
+        self._frame = None
+
+    def top(self, by=None):
+        """Current rankings: {name: DataFrame}, or {name: {group: DataFrame}} with `by`"""
+        if self._frame is None:
+            # Candidates keep their row order, so putting the teams in
+            # order gives ties to the same rows as the combined frame
+            teams = sorted(self._candidates, key=self._team_rank.get)
+            frames = [self._candidates[team] for team in teams]
+            self._frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return top_k(self._frame, self.rankings, self.k, by)
@@ -0,0 +1,137 @@
+# name_index.py
+import re
+import unicodedata
+from array import array
+
+import numpy as np
+
+# Letters NFKD does not decompose, and Arabic-script variants folded to one form
+FOLD_TABLE = str.maketrans({
+    'ø': 'o', 'đ': 'd', 'ð': 'd', 'ł': 'l', 'ħ': 'h', 'ı': 'i', 'þ': 'th',
+    'æ': 'ae', 'œ': 'oe', 'ʿ': None, 'ʾ': None, "'": None, '’': None,
+    'ـ': None,                      # tatweel
+    'ة': 'ه', 'ى': 'ي', 'ٱ': 'ا',
+})
+SEPARATOR_RE = re.compile(r'[\W_]+')
+
+NGRAM = 3
+
+
+def normalize_name(text):
+    """Lower-case, accent-free, single-spaced form of a name used for matching"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = text.casefold().translate(FOLD_TABLE)
+    return SEPARATOR_RE.sub(' ', text).strip()
+
+
+def name_ngrams(padded):
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class NameIndex:
+    """
+    Trigram index over a column of names.
+
+    Names are normalized with normalize_name() and padded with a space on
+    each side, so "Ḥakimi" and "hakimi" match and word starts are
+    trigrams of their own. Postings are kept in CSR form: one array of
+    row positions sorted by trigram plus an offset per trigram. Lookups
+    only touch the postings of the query's trigrams and the candidate
+    names they point to, never the whole column.
+    """
+
+    def __init__(self, names):
+        self._padded = [f" {normalize_name(name)} " if isinstance(name, str) else '' for name in names]
+        self.n_names = len(self._padded)
+
+        trigram_ids = {}
+        pair_trigrams = array('i')
+        pair_rows = array('i')
+        ngram_counts = np.zeros(self.n_names, dtype=np.int32)
+        for row, padded in enumerate(self._padded):
+            ngrams = name_ngrams(padded)
+            ngram_counts[row] = len(ngrams)
+            for ngram in ngrams:
+                pair_trigrams.append(trigram_ids.setdefault(ngram, len(trigram_ids)))
+                pair_rows.append(row)
+
+        pair_trigrams = np.frombuffer(pair_trigrams, dtype=np.int32)
+        order = np.argsort(pair_trigrams, kind='stable')
+        self._rows = np.frombuffer(pair_rows, dtype=np.int32)[order]
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(pair_trigrams, minlength=len(trigram_ids)))))
+        self._trigram_ids = trigram_ids
+        self._ngram_counts = ngram_counts
+
+    def search(self, query, limit=None):
+        """
+        Row positions of names matching `query`, best first.
+
+        Substring matches come first in row order; if there are none, the
+        closest names by trigram similarity are returned instead, so small
+        typos still find the player.
+        """
+        rows = self.substring(query)
+        if not len(rows) and normalize_name(query):
+            rows = np.array([row for row, _ in self.fuzzy(query, limit=limit or 10)], dtype=np.int64)
+        return rows[:limit] if limit else rows
+
+    def substring(self, query):
+        """Row positions (ascending) of names containing `query` anywhere"""
+        return self._match(normalize_name(query))
+
+    def prefix(self, query):
+        """Row positions (ascending) of names with a word starting with `query`"""
+        query = normalize_name(query)
+        return self._match(f" {query}" if query else query)
+
+    def fuzzy(self, query, limit=10, min_similarity=0.5):
+        """
+        [(row, similarity)] of the names most similar to `query`.
+
+        Similarity is the share of the query's trigrams found in the name,
+        so a typo costs a few trigrams rather than the whole match; ties
+        go to the name with fewer trigrams of its own.
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        ngrams = name_ngrams(f" {query} ")
+        postings = [self._postings(ngram) for ngram in ngrams]
+        postings = [rows for rows in postings if len(rows)]
+        if not postings:
+            return []
+
+        rows, shared = np.unique(np.concatenate(postings), return_counts=True)
+        similarity = shared / len(ngrams)
+        keep = similarity >= min_similarity
+        rows, similarity = rows[keep], similarity[keep]
+        # Highest similarity first, then shorter names, then row position
+        best = np.lexsort((rows, self._ngram_counts[rows], -similarity))[:limit]
+        return [(int(rows[i]), float(similarity[i])) for i in best]
+
+    def _postings(self, ngram):
+        trigram_id = self._trigram_ids.get(ngram)
+        if trigram_id is None:
+            return self._rows[:0]
+        return self._rows[self._offsets[trigram_id]:self._offsets[trigram_id + 1]]
+
+    def _match(self, text):
+        if not text:
+            return np.arange(self.n_names)
+
+        if len(text) < NGRAM:
+            # Too short for a trigram of its own: union the trigrams containing it
+            postings = [self._postings(ngram) for ngram in self._trigram_ids if text in ngram]
+            if not postings:
+                return np.array([], dtype=np.int64)
+            return np.unique(np.concatenate(postings)).astype(np.int64)
+
+        # Intersect postings from the rarest trigram up, then verify candidates
+        postings = sorted((self._postings(ngram) for ngram in name_ngrams(text)), key=len)
+        candidates = postings[0]
+        for rows in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return np.array([row for row in candidates if text in self._padded[row]], dtype=np.int64)
@@ -25,15 +25,17 @@ def main():
 
     elif choice == '2':
         print("\n📊 Running scraper only...")
-        from scraper import scrape_morocco_team_table, save_to_csv, get_summary_stats
+        from scraper import scrape_morocco_team_table, get_summary_stats, MOROCCO_TEAM
+        from snapshot_store import SnapshotStore
 
         df = scrape_morocco_team_table()
         if df is not None:
-            save_to_csv(df)
+            store = SnapshotStore()
+            entry = store.save(df, team=MOROCCO_TEAM)
             stats = get_summary_stats(df)
 
             print(f"\n✅ Scraped {stats['total_players']} players")
-            print(f"📁 Data saved to 'morocco_football_team.csv'")
+            print(f"📁 Snapshot saved to '{store.root}/{entry['path']}'")
         else:
             print("❌ Failed to scrape data")
 
@@ -0,0 +1,104 @@
+# scrape_metrics.py
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Stages recorded by the scraper, in pipeline order
+STAGES = ('fetch', 'parse', 'locate', 'extract', 'dataframe')
+
+_hooks = []
+_hooks_lock = threading.Lock()
+
+
+class ScrapeMetrics:
+    """
+    Stage timings and counters for one scrape.
+
+    `stages` maps a stage name to seconds spent in it; `counters` holds
+    byte and row counts such as 'bytes', 'rows' and 'players'.
+    """
+
+    def __init__(self, url=None):
+        self.url = url
+        self.stages = {}
+        self.counters = {}
+        self.error = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @property
+    def total_seconds(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        return {
+            'url': self.url,
+            'stages': dict(self.stages),
+            'counters': dict(self.counters),
+            'total_seconds': self.total_seconds,
+            'error': self.error,
+        }
+
+    def __repr__(self):
+        stages = ', '.join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.stages.items())
+        error = f", error={self.error!r}" if self.error else ''
+        return f"ScrapeMetrics({self.url!r}, {stages}, {self.counters}{error})"
+
+
+class _NullMetrics:
+    """Stand-in used when nobody is listening; every call is a no-op"""
+
+    url = None
+    error = None
+    _context = nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+    def count(self, name, value=1):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+
+def add_metrics_hook(hook):
+    """Register a callable that receives every finished ScrapeMetrics"""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_metrics_hook(hook):
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def metrics_enabled():
+    return bool(_hooks)
+
+
+def emit_metrics(metrics):
+    """Pass `metrics` to every registered hook; hook errors are logged, not raised"""
+    for hook in list(_hooks):
+        try:
+            hook(metrics)
+        except Exception:
+            logger.exception("Metrics hook %r failed", hook)
+
+
+def logging_hook(metrics):
+    """Hook that writes one INFO log line per scrape"""
+    logger.info("scrape %s", metrics)
@@ -1,158 +1,924 @@
 # scraper.py
+import random
+import threading
+import time
+from array import array
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+import numpy as np
 import pandas as pd
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import unquote
+
+from fixture_store import FixtureStore
+from scrape_metrics import NULL_METRICS, ScrapeMetrics, emit_metrics, metrics_enabled
+from squad_stats import SquadStats
+
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+except ImportError:
+    lxml_html = None
+
+try:
+    import html5lib
+except ImportError:
+    html5lib = None
+
+WIKIPEDIA_BASE_URL = "https://en.wikipedia.org/wiki/"
+MOROCCO_TEAM_URL = WIKIPEDIA_BASE_URL + "Morocco_national_football_team"
+MOROCCO_TEAM = "Morocco"
+
+# How much of each page to parse, see parse_players_table()
+PARSE_MODES = ('full', 'strained', 'section')
+DEFAULT_PARSE_MODE = 'section'
+
+# Tag of the extracted rows kept in HttpCache; bump it whenever the table
+# location or row extraction changes so older cached rows are re-parsed
+PARSED_CACHE_VERSION = 2
+
+# HTML parser backends; 'lxml-xpath' skips BeautifulSoup and walks the
+# lxml tree directly. 'auto' picks the first installed of AUTO_PARSER_ORDER.
+PARSER_BACKENDS = ('html.parser', 'lxml', 'html5lib', 'lxml-xpath')
+AUTO_PARSER_ORDER = ('lxml-xpath', 'lxml', 'html.parser')
+DEFAULT_PARSER = 'auto'
+
+HEADINGS_AND_TABLES = SoupStrainer(['h2', 'h3', 'h4', 'table'])
+HEADING_RE = re.compile(r'<h([2-4])\b[^>]*>(.*?)</h\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+
+if lxml_html is not None:
+    # Text nodes BeautifulSoup's get_text() would return
+    _VISIBLE_TEXT = etree.XPath(
+        'descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]'
+    )
+
+# Squad table header texts and the column names they map to
+HEADER_NAMES = {
+    'No.': 'Number',
+    'Pos.': 'Position',
+    'Player': 'Player',
+    'Caps': 'Caps',
+    'Goals': 'Goals',
+    'Club': 'Club',
+}
+# Header names that mark a squad table and how much each one counts,
+# see score_table()
+SQUAD_HEADER_WEIGHTS = {
+    'Pos.': 3,
+    'Player': 3,
+    'No.': 2,
+    'Caps': 2,
+    'Goals': 2,
+    'Date of birth': 1,
+    'Club': 1,
+}
+
+# Output dtypes of the squad DataFrame, see apply_schema()
+SQUAD_SCHEMA = {
+    'Team': 'category',
+    'Number': 'Int8',
+    'Position': 'category',
+    'Club': 'category',
+    'Caps': 'Int16',
+    'Goals': 'Int16',
+    'Birth_Date': 'datetime64[ns]',
+    'Birth_Year': 'Int16',
+    'Age': 'Int8',
+    'Age_Days': 'Int32',
+    'Goal_Ratio': 'float32',
+}
+INT_DTYPE_RANGES = {
+    'Int8': (-2 ** 7, 2 ** 7 - 1),
+    'Int16': (-2 ** 15, 2 ** 15 - 1),
+    'Int32': (-2 ** 31, 2 ** 31 - 1),
+}
+
+# Where the squad table was found last time, keyed by page, see
+# find_players_table()
+_table_signatures = {}
+
+DEFAULT_HEADERS = ('Number', 'Position', 'Player', 'Date_of_Birth', 'Caps', 'Goals', 'Club')
+NUMERIC_COLUMNS = ('Number', 'Caps', 'Goals')
+
+FOOTNOTE_RE = re.compile(r'\[.*?\]')
+AGE_RE = re.compile(r'\(age.*?\)')
+PARENS_RE = re.compile(r'[()]')
+NAN = float('nan')
+
+# Birth date formats found in squad tables: the hidden ISO date Wikipedia
+# adds for sorting, then plain-text dates as a fallback
+ISO_DATE_RE = r'(\d{4}-\d{2}-\d{2})'
+TEXT_DATE_FORMATS = (
+    (r'(\d{1,2} [A-Z][a-z]+ \d{4})', '%d %B %Y'),
+    (r'([A-Z][a-z]+ \d{1,2}, \d{4})', '%B %d, %Y'),
+)
+YEAR_RE = r'(\d{4})'
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# HTTP session defaults, see create_session()
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+MAX_BACKOFF = 10
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+POOL_SIZE = 16
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def scrape_morocco_team_table(cache=None, session=None, fixtures=None):
+    try:
+        return scrape_team_table(MOROCCO_TEAM_URL, cache=cache, session=session, fixtures=fixtures)
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+
+def team_page_url(team):
+    """Turn a Wikipedia page title or URL into a full page URL"""
+    if team.startswith(('http://', 'https://')):
+        return team
+    return WIKIPEDIA_BASE_URL + team.strip().replace(' ', '_')
+
+
+def team_name_from_page(team):
+    """Derive a short team name ('Morocco') from a page title or URL"""
+    title = unquote(team.rstrip('/').rsplit('/', 1)[-1]).replace('_', ' ')
+    title = re.sub(r'\s+national\s+(association\s+)?football\s+team$', '', title, flags=re.IGNORECASE)
+    return title.strip()
+
+
+class ScraperSession(requests.Session):
+    """
+    Connection-pooled session with a default timeout and retries.
+
+    Connection errors, timeouts and RETRY_STATUS_CODES responses are
+    retried up to `max_retries` times with exponential backoff and full
+    jitter; a Retry-After header on a 429 or 503 is honoured instead, up
+    to MAX_BACKOFF seconds. Connections are kept alive and reused across
+    requests.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, pool_size=POOL_SIZE):
+        super().__init__()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers.update(REQUEST_HEADERS)
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            delay = None
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+                delay = retry_after_delay(response)
+                response.close()
+
+            time.sleep(self.backoff_delay(attempt) if delay is None else delay)
+
+    def backoff_delay(self, attempt):
+        """Seconds to wait before retry number `attempt + 1`"""
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff_factor * 2 ** attempt))
+
+
+def retry_after_delay(response):
+    """
+    Seconds a 429 / 503 response asks to wait via Retry-After, capped at
+    MAX_BACKOFF; None when there is no usable header.
+    """
+    value = response.headers.get('Retry-After')
+    if response.status_code not in (429, 503) or not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = int(value)
+    else:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(MAX_BACKOFF, max(0, seconds))
+
+
+def create_session(**kwargs):
+    """Create a new ScraperSession; keyword arguments override the defaults"""
+    return ScraperSession(**kwargs)
+
 
+def get_session():
+    """Return the process-wide session shared by all scrapes"""
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
 
-def scrape_morocco_team_table():
-    url = "https://en.wikipedia.org/wiki/Morocco_national_football_team"
+
+def fetch_page(url, cache=None, session=None, fixtures=None):
+    """Download a page and return the raw response bytes"""
+    content, _ = _fetch_with_cache(url, cache, session, fixtures)
+    return content
+
+
+def _fetch_with_cache(url, cache, session=None, fixtures=None):
+    """
+    Fetch `url`, revalidating against `cache`; returns (content, not_modified).
+
+    `fixtures` is a FixtureStore to record into or replay from; when None
+    the SCRAPER_FIXTURE_MODE environment variable decides.
+    """
+    if fixtures is None:
+        fixtures = FixtureStore.from_env()
+
+    if fixtures is not None and fixtures.replaying:
+        response = fixtures.load(url)
+        response.raise_for_status()
+        if cache is not None:
+            cache.count('misses')
+            cache.store(url, response)
+        return response.content, False
+
+    session = session or get_session()
+    entry = cache.load(url) if cache is not None else None
+    headers = dict(REQUEST_HEADERS)
+    # Recording needs the full body, so never revalidate then
+    if cache is not None and fixtures is None:
+        headers.update(cache.conditional_headers(entry))
+
+    response = session.get(url, headers=headers)
+
+    if response.status_code == 304 and entry is not None:
+        cache.count('not_modified')
+        return entry['content'], True
+
+    response.raise_for_status()
+    if fixtures is not None:
+        fixtures.save(url, response)
+    if cache is not None:
+        cache.count('misses')
+        cache.store(url, response)
+    return response.content, False
+
+
+def scrape_team_table(url, cache=None, parse_mode=None, parser=None, session=None, fixtures=None,
+                      return_metrics=False):
+    """
+    Scrape the players table from one team page; raises on failure.
+
+    With `return_metrics` the result is a (df, ScrapeMetrics) tuple. Stage
+    timings are only collected when requested or when a metrics hook is
+    registered, see scrape_metrics.add_metrics_hook().
+    """
+    collect = return_metrics or metrics_enabled()
+    metrics = ScrapeMetrics(url) if collect else NULL_METRICS
 
     try:
-        # Send request to Wikipedia
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        df = _scrape_team_table(url, cache, parse_mode, parser, session, fixtures, metrics)
+    except Exception as e:
+        if collect:
+            metrics.error = f"{e.__class__.__name__}: {e}"
+        raise
+    finally:
+        if collect:
+            emit_metrics(metrics)
+
+    return (df, metrics) if return_metrics else df
+
+
+def _scrape_team_table(url, cache, parse_mode, parser, session, fixtures, metrics):
+    with metrics.stage('fetch'):
+        content, not_modified = _fetch_with_cache(url, cache, session, fixtures)
+    metrics.count('bytes', len(content))
+
+    # Page unchanged since the last fetch: reuse the previously extracted
+    # rows, but rebuild the frame so Age and the dtypes are current
+    table = None
+    if not_modified:
+        table = cache.load_parsed(url, version=PARSED_CACHE_VERSION)
+        if table is not None:
+            cache.count('hits')
+            metrics.count('cache_hits')
+
+    if table is None:
+        table = extract_players_table(content, parse_mode=parse_mode, parser=parser, metrics=metrics, url=url)
+        if cache is not None:
+            cache.store_parsed(url, table, version=PARSED_CACHE_VERSION)
+
+    df = None
+    if table is not None:
+        with metrics.stage('dataframe'):
+            df = rows_to_dataframe(*table)
+    metrics.count('players', len(df) if df is not None else 0)
+    return df
+
+
+def scrape_team_tables(teams, max_workers=8, cache=None, session=None, fixtures=None):
+    """
+    Scrape several team pages concurrently.
+
+    `teams` is a list of page URLs or Wikipedia titles; `cache` (an
+    HttpCache), `session` and `fixtures` (a FixtureStore) are shared by
+    all workers. Returns a tuple
+    (df, failures): one combined DataFrame with a `Team` column (None if
+    every team failed) and a dict mapping each failed team to its error.
+    """
+    # Drop duplicates, treating a title and its URL as the same team
+    unique_teams = {}
+    for team in teams:
+        unique_teams.setdefault(team_page_url(team), team)
+    teams = list(unique_teams.values())
+    frames = []
+    failures = {}
+
+    if not teams:
+        return None, failures
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(teams))) as executor:
+        futures = {
+            team: executor.submit(scrape_team_table, team_page_url(team), cache,
+                                  session=session, fixtures=fixtures)
+            for team in teams
         }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
 
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        for team, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as e:
+                failures[team] = str(e) or e.__class__.__name__
+                continue
 
-        # Method 1: Look for tables with players section heading
-        players_section = None
-        for h2 in soup.find_all(['h2', 'h3', 'h4']):
-            if 'player' in h2.get_text(strip=True).lower():
-                players_section = h2
-                break
+            if df is None:
+                failures[team] = "No players table found"
+                continue
 
-        target_table = None
+            df.insert(0, 'Team', team_name_from_page(team))
+            frames.append(df)
 
-        # First try to find table near players section
-        if players_section:
-            next_element = players_section.find_next_sibling()
-            while next_element:
-                if next_element.name == 'table':
-                    target_table = next_element
-                    break
-                next_element = next_element.find_next_sibling()
-
-        # If not found, try all tables on page
-        if not target_table:
-            all_tables = soup.find_all('table')
-            for i, table in enumerate(all_tables):
-                table_text = table.get_text()
-                if any(keyword in table_text.lower() for keyword in ['gk', 'df', 'mf', 'fw', 'caps', 'goals']):
-                    headers = []
-                    try:
-                        header_row = table.find('tr')
-                        for th in header_row.find_all(['th', 'td']):
-                            header_text = th.get_text(strip=True)
-                            headers.append(header_text)
-                        if any(hdr in str(headers) for hdr in ['No.', 'Pos.', 'Player', 'Caps', 'Goals']):
-                            target_table = table
-                            break
-                    except:
-                        continue
-
-        if not target_table:
-            return None
+    if not frames:
+        return None, failures
 
-        # Extract headers
-        headers = []
-        header_row = target_table.find('tr')
-        if not header_row:
-            thead = target_table.find('thead')
-            if thead:
-                header_row = thead.find('tr')
-
-        if header_row:
-            for th in header_row.find_all(['th', 'td']):
-                header_text = th.get_text(strip=True)
-                if header_text == 'No.':
-                    headers.append('Number')
-                elif header_text == 'Pos.':
-                    headers.append('Position')
-                elif header_text == 'Player':
-                    headers.append('Player')
-                elif 'Date of birth' in header_text or 'Birth' in header_text:
-                    headers.append('Date_of_Birth')
-                elif header_text == 'Caps':
-                    headers.append('Caps')
-                elif header_text == 'Goals':
-                    headers.append('Goals')
-                elif header_text == 'Club':
-                    headers.append('Club')
-                else:
-                    headers.append(header_text)
-        else:
-            headers = ['Number', 'Position', 'Player', 'Date_of_Birth', 'Caps', 'Goals', 'Club']
+    # Categories differ per team, so re-apply the schema after combining
+    return apply_schema(pd.concat(frames, ignore_index=True)), failures
 
-        # Extract data rows
-        data = []
-        tbody = target_table.find('tbody')
-        rows = tbody.find_all('tr') if tbody else target_table.find_all('tr')[1:]
 
-        for row in rows:
-            if 'sortbottom' in row.get('class', []) or 'mw-empty-elt' in row.get('class', []):
-                continue
+def parse_players_table(content, parse_mode=None, parser=None, metrics=None, url=None):
+    """
+    Extract the players table from a team page into a DataFrame.
+
+    `parse_mode` controls how much of the page is turned into a tree:
+    'full' parses everything, 'strained' keeps only headings and tables,
+    and 'section' parses just the bytes of the players section (falling
+    back to 'strained' when that section has no usable table).
+
+    `parser` picks the HTML backend, see PARSER_BACKENDS; 'auto' uses the
+    fastest one installed. `metrics` is an optional ScrapeMetrics. When
+    `url` is given the table's position is remembered so later parses of
+    the same page layout skip the table search.
+    """
+    metrics = metrics or NULL_METRICS
+    table = extract_players_table(content, parse_mode, parser, metrics, url)
+    if table is None:
+        return None
+    with metrics.stage('dataframe'):
+        return rows_to_dataframe(*table)
+
+
+def extract_players_table(content, parse_mode=None, parser=None, metrics=None, url=None):
+    """
+    Locate the players table like parse_players_table() but return its raw
+    (header_texts, rows) cell texts, or None when there is no such table.
+    """
+    parse_mode = parse_mode or DEFAULT_PARSE_MODE
+    if parse_mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode: {parse_mode!r}")
+    parser = resolve_parser(parser)
+    metrics = metrics or NULL_METRICS
+
+    table = None
+    if parse_mode == 'section':
+        with metrics.stage('parse'):
+            section = players_section_markup(content)
+        if section is not None:
+            table = _locate_players_table(section, 'full', parser, metrics,
+                                          signature_key=url and (url, 'section', parser))
+        if table is None:
+            parse_mode = 'strained'
+
+    if table is None:
+        table = _locate_players_table(content, parse_mode, parser, metrics,
+                                      signature_key=url and (url, parse_mode, parser))
+    if table is None:
+        return None
 
-            row_data = []
-            cells = row.find_all(['td', 'th'])
+    metrics.count('rows', len(table[1]))
+    return table
 
-            if len(cells) >= 4:
-                for i, cell in enumerate(cells):
-                    text = cell.get_text(strip=True, separator=' ')
 
-                    if i == 0:
-                        text = re.sub(r'\[.*?\]', '', text)
-                    elif i == 2:
-                        text = re.sub(r'\[.*?\]', '', text)
-                    elif i == 3:
-                        text = re.sub(r'\(age.*?\)', '', text)
-                        text = re.sub(r'[()]', '', text).strip()
+def available_parsers():
+    """Return the parser backends that can be used in this environment"""
+    return [name for name in PARSER_BACKENDS if _parser_installed(name)]
 
-                    row_data.append(text)
 
-                while len(row_data) < len(headers):
-                    row_data.append('')
+def resolve_parser(parser=None):
+    """Map None / 'auto' to the fastest installed backend and validate names"""
+    parser = parser or DEFAULT_PARSER
+    if parser == 'auto':
+        return next(name for name in AUTO_PARSER_ORDER if name in available_parsers())
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {parser!r}")
+    if parser not in available_parsers():
+        raise ValueError(f"Parser backend {parser!r} is not installed")
+    return parser
 
-                data.append(row_data[:len(headers)])
 
-        if not data:
+def _parser_installed(name):
+    if name in ('lxml', 'lxml-xpath'):
+        return lxml_html is not None
+    if name == 'html5lib':
+        return html5lib is not None
+    return True
+
+
+def _locate_players_table(content, parse_mode, parser, metrics=NULL_METRICS, signature_key=None):
+    """Parse `content` with `parser` and return (header_texts, rows) or None"""
+    if parser == 'lxml-xpath':
+        with metrics.stage('parse'):
+            doc = _make_lxml_document(content)
+        with metrics.stage('locate'):
+            table = find_players_table_lxml(doc, signature_key)
+        if table is None:
             return None
+        with metrics.stage('extract'):
+            return extract_table_rows_lxml(table)
+
+    with metrics.stage('parse'):
+        soup = make_soup(content, parse_mode, parser)
+    with metrics.stage('locate'):
+        table = find_players_table(soup, signature_key)
+    if not table:
+        return None
+    with metrics.stage('extract'):
+        return extract_table_rows(table)
+
+
+def make_soup(content, parse_mode='full', parser='html.parser'):
+    """Parse a page, keeping only headings and tables in 'strained' mode"""
+    # Decode up front: html5lib sniffs bytes on its own and falls back to
+    # windows-1252 for pages without a <meta charset>
+    content = _decode_markup(content)
+    # html5lib always builds the whole tree and ignores parse_only
+    if parse_mode == 'strained' and parser != 'html5lib':
+        return BeautifulSoup(content, parser, parse_only=HEADINGS_AND_TABLES)
+    return BeautifulSoup(content, parser)
+
+
+def players_section_markup(content):
+    """
+    Cut the players section out of the raw page without building a tree.
+
+    Returns the markup from the first heading mentioning players up to the
+    next heading of the same or a higher level, or None if there is none.
+    """
+    content = _decode_markup(content)
+    if content is None:
+        return None
 
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=headers)
+    for match in HEADING_RE.finditer(content):
+        heading_text = TAG_RE.sub('', match.group(2))
+        if 'player' not in heading_text.lower():
+            continue
+
+        level = int(match.group(1))
+        next_heading = re.compile(r'<h[2-%d]\b' % level, re.IGNORECASE).search(content, match.end())
+        end = next_heading.start() if next_heading else len(content)
+        return content[match.start():end]
+
+    return None
+
+
+def _decode_markup(content):
+    if isinstance(content, bytes):
+        return UnicodeDammit(content, is_html=True).unicode_markup
+    return content
+
+
+def find_players_table(soup, signature_key=None):
+    """
+    Locate the squad table in a parsed page.
+
+    Tries, in order: the table signature remembered for `signature_key`,
+    the first table after a heading mentioning players, and the best
+    candidate according to score_table().
+    """
+    all_tables = soup.find_all('table')
+
+    # Same page layout as last time: check the remembered table only
+    signature = _table_signatures.get(signature_key) if signature_key else None
+    if signature and signature['index'] < len(all_tables):
+        table = all_tables[signature['index']]
+        if tuple(_table_features(table)[2]) == signature['headers']:
+            return table
+
+    # Method 1: Look for tables with players section heading
+    players_section = None
+    for h2 in soup.find_all(['h2', 'h3', 'h4']):
+        if 'player' in h2.get_text(strip=True).lower():
+            players_section = h2
+            break
+
+    target_table = None
+
+    # First try to find table near players section
+    if players_section:
+        next_element = players_section.find_next_sibling()
+        while next_element:
+            if next_element.name == 'table':
+                target_table = next_element
+                break
+            next_element = next_element.find_next_sibling()
+
+    # If not found, rank all tables on the page by their headers
+    if not target_table:
+        ranked = rank_tables(_table_features(table) for table in all_tables)
+        if ranked:
+            target_table = all_tables[ranked[0][1]]
+
+    if target_table and signature_key:
+        index = next(i for i, table in enumerate(all_tables) if table is target_table)
+        heading = players_section.get_text(strip=True) if players_section else None
+        _remember_signature(signature_key, heading, index, _table_features(target_table)[2])
+
+    return target_table
+
+
+def _table_features(table):
+    """(classes, caption text, first-row <th> texts) of a BeautifulSoup table"""
+    caption = table.find('caption', recursive=False)
+    header_row = table.find('tr')
+    header_cells = [th.get_text(strip=True) for th in header_row.find_all('th')] if header_row else []
+    return table.get('class', []), caption.get_text(' ', strip=True) if caption else '', header_cells
+
+
+def score_table(classes, caption, header_cells):
+    """
+    Score how much a table looks like a squad list, from its markup only.
+
+    Only the class attribute, the caption and the first row's header cells
+    are looked at, so the body of the table is never serialized. Tables
+    without any squad column header score 0.
+    """
+    header_text = ' '.join(header_cells)
+    score = sum(weight for name, weight in SQUAD_HEADER_WEIGHTS.items() if name in header_text)
+    if not score:
+        return 0
+
+    if 'wikitable' in classes:
+        score += 1
+    if any(word in caption.lower() for word in ('squad', 'player')):
+        score += 2
+    return score
+
+
+def rank_tables(features):
+    """
+    Rank candidate tables by score_table(), best first.
+
+    `features` yields (classes, caption, header_cells) per table in page
+    order. Returns (score, index) pairs for tables that scored above 0;
+    ties keep page order.
+    """
+    scores = [(score_table(*table_features), index) for index, table_features in enumerate(features)]
+    return sorted((pair for pair in scores if pair[0] > 0), key=lambda pair: (-pair[0], pair[1]))
+
+
+def _remember_signature(signature_key, heading, index, header_cells):
+    _table_signatures[signature_key] = {
+        'heading': heading,
+        'index': index,
+        'headers': tuple(header_cells),
+    }
 
-        # Clean the data
-        df = df[df['Player'].notna() & (df['Player'] != '')]
 
-        # Convert numeric columns
-        for col in ['Number', 'Caps', 'Goals']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+def clear_table_signatures():
+    """Forget every remembered table position"""
+    _table_signatures.clear()
 
-        # Extract birth year and calculate age
-        if 'Date_of_Birth' in df.columns:
-            df['Birth_Year'] = df['Date_of_Birth'].str.extract(r'(\d{4})')
-            df['Birth_Year'] = pd.to_numeric(df['Birth_Year'], errors='coerce')
-            from datetime import datetime
-            current_year = datetime.now().year
-            df['Age'] = current_year - df['Birth_Year']
 
-        # Calculate goal ratio
-        if all(col in df.columns for col in ['Caps', 'Goals']):
-            df['Goal_Ratio'] = df.apply(
-                lambda x: x['Goals'] / x['Caps'] if x['Caps'] > 0 else 0,
-                axis=1
-            )
+def extract_table_rows(target_table):
+    """
+    Read the header texts and raw cell texts of a BeautifulSoup table.
 
-        return df
+    Returns (header_texts, rows); header_texts is None when the table has
+    no header row.
+    """
+    # html5lib keeps <style>/<script> contents as plain text; drop them so
+    # every backend sees the same cell text
+    for tag in target_table.find_all(['style', 'script', 'template']):
+        tag.decompose()
 
-    except Exception as e:
-        print(f"Error: {e}")
+    header_texts = None
+    header_row = target_table.find('tr')
+    if not header_row:
+        thead = target_table.find('thead')
+        if thead:
+            header_row = thead.find('tr')
+
+    if header_row:
+        header_texts = [th.get_text(strip=True) for th in header_row.find_all(['th', 'td'])]
+
+    tbody = target_table.find('tbody')
+    rows = tbody.find_all('tr') if tbody else target_table.find_all('tr')[1:]
+
+    data = []
+    for row in rows:
+        # The header row sits in <tbody> on most pages (and always once
+        # html5lib has added the implied <tbody>)
+        if row is header_row:
+            continue
+        if 'sortbottom' in row.get('class', []) or 'mw-empty-elt' in row.get('class', []):
+            continue
+        data.append([cell.get_text(strip=True, separator=' ') for cell in row.find_all(['td', 'th'])])
+
+    return header_texts, data
+
+
+def _make_lxml_document(content):
+    content = _decode_markup(content)
+    if not content or not content.strip():
         return None
+    return lxml_html.document_fromstring(content)
+
+
+def _lxml_text(element, separator=''):
+    """lxml equivalent of BeautifulSoup's get_text(strip=True, separator=...)"""
+    return separator.join(text.strip() for text in _VISIBLE_TEXT(element) if text.strip())
+
+
+def find_players_table_lxml(doc, signature_key=None):
+    """Locate the squad table with XPath, mirroring find_players_table()"""
+    if doc is None:
+        return None
+
+    all_tables = list(doc.iter('table'))
+
+    signature = _table_signatures.get(signature_key) if signature_key else None
+    if signature and signature['index'] < len(all_tables):
+        table = all_tables[signature['index']]
+        if tuple(_table_features_lxml(table)[2]) == signature['headers']:
+            return table
+
+    players_section = None
+    target_table = None
+    for heading in doc.xpath('//h2 | //h3 | //h4'):
+        if 'player' in _lxml_text(heading).lower():
+            players_section = heading
+            for sibling in heading.itersiblings():
+                if sibling.tag == 'table':
+                    target_table = sibling
+                    break
+            break
+
+    if target_table is None:
+        ranked = rank_tables(_table_features_lxml(table) for table in all_tables)
+        if ranked:
+            target_table = all_tables[ranked[0][1]]
+
+    if target_table is not None and signature_key:
+        index = next(i for i, table in enumerate(all_tables) if table is target_table)
+        heading = _lxml_text(players_section) if players_section is not None else None
+        _remember_signature(signature_key, heading, index, _table_features_lxml(target_table)[2])
+
+    return target_table
+
+
+def _table_features_lxml(table):
+    """lxml counterpart of _table_features()"""
+    caption = table.find('caption')
+    header_row = next(table.iter('tr'), None)
+    header_cells = [_lxml_text(th) for th in header_row.iter('th')] if header_row is not None else []
+    return table.get('class', '').split(), _lxml_text(caption, ' ') if caption is not None else '', header_cells
+
+
+def extract_table_rows_lxml(target_table):
+    """lxml counterpart of extract_table_rows()"""
+    header_texts = None
+    header_row = next(target_table.iter('tr'), None)
+    if header_row is not None:
+        header_texts = [_lxml_text(th) for th in header_row.iter('th', 'td')]
+
+    tbody = next(target_table.iter('tbody'), None)
+    rows = list(tbody.iter('tr')) if tbody is not None else list(target_table.iter('tr'))[1:]
+
+    data = []
+    for row in rows:
+        if row is header_row:
+            continue
+        row_classes = row.get('class', '').split()
+        if 'sortbottom' in row_classes or 'mw-empty-elt' in row_classes:
+            continue
+        data.append([_lxml_text(cell, ' ') for cell in row.iter('td', 'th')])
+
+    return header_texts, data
+
+
+def rows_to_dataframe(header_texts, rows):
+    """Clean raw header and cell texts into the squad DataFrame"""
+    headers = normalize_headers(header_texts)
+    if 'Player' not in headers:
+        return None
+
+    columns = table_to_columns(headers, rows, cleaners=SQUAD_CELL_CLEANERS,
+                               numeric_columns=NUMERIC_COLUMNS, required_columns=('Player',))
+    if not len(columns[0]):
+        return None
+
+    # Create DataFrame; columns are passed by position so repeated
+    # header names survive
+    df = pd.DataFrame(dict(enumerate(columns)))
+    df.columns = headers
+
+    return apply_schema(add_derived_columns(df))
+
+
+def normalize_headers(header_texts):
+    """Map squad table header texts to DataFrame column names"""
+    if not header_texts:
+        return list(DEFAULT_HEADERS)
+
+    headers = []
+    for header_text in header_texts:
+        if 'Date of birth' in header_text or 'Birth' in header_text:
+            headers.append('Date_of_Birth')
+        else:
+            headers.append(HEADER_NAMES.get(header_text, header_text))
+    return headers
+
+
+def table_to_columns(headers, rows, cleaners=None, numeric_columns=(), required_columns=(),
+                     min_cells=4):
+    """
+    Turn raw table rows into one buffer per column.
+
+    `rows` is an iterable of cell-text lists as returned by
+    extract_table_rows(). Rows with fewer than `min_cells` cells are
+    skipped, short rows are padded with '' and long rows truncated.
+    `cleaners` maps a cell position to a function applied to its text.
+    Columns named in `numeric_columns` are parsed to floats on the way in
+    (NaN when not a number) and returned as float64 arrays; the others
+    are lists of strings. Rows whose `required_columns` are empty are
+    dropped. Returns the columns as a list aligned with `headers`.
+    """
+    cleaners = cleaners or {}
+    width = len(headers)
+    numeric = [header in numeric_columns for header in headers]
+    required = [i for i, header in enumerate(headers) if header in required_columns]
+    positions = [(i, cleaners.get(i)) for i in range(width)]
+    buffers = [array('d') if is_numeric else [] for is_numeric in numeric]
+
+    for cells in rows:
+        if len(cells) < min_cells:
+            continue
+
+        values = []
+        for i, cleaner in positions:
+            text = cells[i] if i < len(cells) else ''
+            values.append(cleaner(text) if cleaner else text)
+
+        if any(not values[i] for i in required):
+            continue
+
+        for buffer, is_numeric, text in zip(buffers, numeric, values):
+            buffer.append(_parse_number(text) if is_numeric else text)
+
+    return [np.array(buffer, dtype='float64') if is_numeric else buffer
+            for buffer, is_numeric in zip(buffers, numeric)]
+
+
+def _parse_number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return NAN
+
+
+def _strip_footnotes(text):
+    return FOOTNOTE_RE.sub('', text)
+
+
+def _clean_birth_date(text):
+    return PARENS_RE.sub('', AGE_RE.sub('', text)).strip()
+
+
+# Cleaners applied by position to squad table cells: footnote markers on
+# the number and player name, the "(age N)" suffix on the birth date
+SQUAD_CELL_CLEANERS = {0: _strip_footnotes, 2: _strip_footnotes, 3: _clean_birth_date}
+
+
+def add_derived_columns(df, today=None):
+    """
+    Add Birth_Date, Birth_Year, Age, Age_Days and Goal_Ratio in place.
+
+    Everything is computed column-wise so it scales to very large frames.
+    Age is the exact age in years on `today` (default: the current date);
+    when only a birth year is known it falls back to the year difference.
+    Goal_Ratio is Goals / Caps, and 0 for players without caps.
+    """
+    today = pd.Timestamp(today or date.today()).normalize()
+
+    # Birth date, age in days and exact age in years
+    if 'Date_of_Birth' in df.columns:
+        dob_text = df['Date_of_Birth'].astype(str)
+        birth_date = pd.to_datetime(dob_text.str.extract(ISO_DATE_RE, expand=False),
+                                    format='%Y-%m-%d', errors='coerce')
+        for pattern, date_format in TEXT_DATE_FORMATS:
+            missing = birth_date.isna()
+            if not missing.any():
+                break
+            birth_date[missing] = pd.to_datetime(dob_text[missing].str.extract(pattern, expand=False),
+                                                 format=date_format, errors='coerce')
+
+        year_only = pd.to_numeric(dob_text.str.extract(YEAR_RE, expand=False), errors='coerce')
+        had_birthday = ((birth_date.dt.month < today.month) |
+                        ((birth_date.dt.month == today.month) & (birth_date.dt.day <= today.day)))
+
+        df['Birth_Date'] = birth_date
+        df['Birth_Year'] = birth_date.dt.year.fillna(year_only)
+        df['Age'] = (today.year - birth_date.dt.year - (~had_birthday).astype(int)).fillna(
+            today.year - year_only)
+        df['Age_Days'] = (today - birth_date).dt.days
+
+    # Calculate goal ratio
+    if all(col in df.columns for col in ['Caps', 'Goals']):
+        has_caps = df['Caps'] > 0
+        df['Goal_Ratio'] = (df['Goals'] / df['Caps'].where(has_caps)).where(has_caps, 0.0)
+
+    return df
+
+
+def apply_schema(df, schema=None):
+    """
+    Cast squad columns to the compact dtypes in SQUAD_SCHEMA.
+
+    Only columns present in `df` are touched. Values that do not fit a
+    nullable integer dtype (fractions, out of range) become <NA>, the same
+    way pd.to_numeric(errors='coerce') treats unparseable text.
+    """
+    schema = schema or SQUAD_SCHEMA
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+
+        if dtype in INT_DTYPE_RANGES:
+            low, high = INT_DTYPE_RANGES[dtype]
+            values = pd.to_numeric(df[col], errors='coerce')
+            df[col] = values.where(values.between(low, high) & (values % 1 == 0)).astype(dtype)
+        elif dtype == 'datetime64[ns]':
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def memory_usage_report(df):
+    """
+    Per-column dtype and memory footprint in bytes (strings counted deeply).
+
+    The last row, 'Total', sums the whole frame including the index.
+    """
+    usage = df.memory_usage(deep=True)
+    report = pd.DataFrame({
+        'dtype': [str(df[col].dtype) if col in df.columns else '' for col in usage.index],
+        'bytes': usage.values,
+    }, index=usage.index)
+    report.loc['Total'] = ['', int(usage.sum())]
+    return report
 
 
 def save_to_csv(df, filename='morocco_football_team.csv'):
@@ -168,48 +934,7 @@ def get_summary_stats(df):
     """Get summary statistics from the DataFrame"""
     if df is None:
         return {}
-
-    stats = {
-        'total_players': len(df),
-        'positions': {},
-        'total_caps': 0,
-        'total_goals': 0,
-        'avg_age': None,
-        'top_scorer': None,
-        'most_experienced': None
-    }
-
-    if 'Position' in df.columns:
-        stats['positions'] = df['Position'].value_counts().to_dict()
-
-    if 'Caps' in df.columns:
-        stats['total_caps'] = int(df['Caps'].sum())
-
-    if 'Goals' in df.columns:
-        stats['total_goals'] = int(df['Goals'].sum())
-
-    if 'Age' in df.columns:
-        stats['avg_age'] = float(df['Age'].mean())
-
-    if all(col in df.columns for col in ['Player', 'Goals']):
-        if not df['Goals'].isna().all():
-            top_idx = df['Goals'].idxmax()
-            stats['top_scorer'] = {
-                'name': df.loc[top_idx, 'Player'],
-                'goals': int(df.loc[top_idx, 'Goals']),
-                'caps': int(df.loc[top_idx, 'Caps']) if 'Caps' in df.columns else 0
-            }
-
-    if all(col in df.columns for col in ['Player', 'Caps']):
-        if not df['Caps'].isna().all():
-            top_idx = df['Caps'].idxmax()
-            stats['most_experienced'] = {
-                'name': df.loc[top_idx, 'Player'],
-                'caps': int(df.loc[top_idx, 'Caps']),
-                'goals': int(df.loc[top_idx, 'Goals']) if 'Goals' in df.columns else 0
-            }
-
-    return stats
+    return SquadStats.from_frame(df).to_dict()
 
 
 if __name__ == "__main__":
@@ -223,8 +948,11 @@ if __name__ == "__main__":
     if df is not None:
         print(f"✅ Successfully scraped {len(df)} players!")
 
-        # Save to CSV
-        save_to_csv(df)
+        # Add to the snapshot history, like run.py and the dashboard
+        from snapshot_store import SnapshotStore
+        store = SnapshotStore()
+        entry = store.save(df, team=MOROCCO_TEAM)
+        print(f"📁 Snapshot saved to '{store.root}/{entry['path']}'")
 
         # Print summary
         stats = get_summary_stats(df)
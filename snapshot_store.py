@@ -0,0 +1,211 @@
+# snapshot_store.py
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_SNAPSHOT_DIR = 'snapshots'
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'manifest.lock'
+COMPRESSION = 'zstd'
+
+SNAPSHOT_PATH_RE = re.compile(
+    r'^team=(?P<team>[^/]+)/date=(?P<date>\d{4}-\d{2}-\d{2})/(?P<time>\d{6}-\d{6})\.parquet$'
+)
+
+
+class SnapshotStore:
+    """
+    History of scraped squads as compressed Parquet files.
+
+    Each scrape is written to <root>/team=<team>/date=<YYYY-MM-DD>/<time>.parquet
+    and listed in a small JSON manifest, so readers can find the latest
+    snapshot or a date range without listing directories. Files and the
+    manifest are written to a temporary name first and then renamed, so a
+    reader never sees a half-written snapshot. Manifest updates hold an
+    flock() on <root>/manifest.lock, so several processes (run.py and the
+    dashboard) can save into the same root; a manifest that can't be read
+    is rebuilt from the files on disk.
+    """
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    @contextmanager
+    def _manifest_lock(self):
+        """Hold the manifest against other threads and, with fcntl, other processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, LOCK_NAME), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, df, team, scraped_at=None):
+        """Write `df` as a new snapshot of `team` and return its manifest entry"""
+        scraped_at = scraped_at or datetime.now()
+        relative_path = os.path.join(
+            f"team={_safe_name(team)}",
+            f"date={scraped_at:%Y-%m-%d}",
+            f"{scraped_at:%H%M%S-%f}.parquet",
+        )
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table, tmp_path, compression=COMPRESSION)
+        os.replace(tmp_path, path)
+
+        entry = {
+            'team': team,
+            'scraped_at': scraped_at.isoformat(),
+            'path': relative_path.replace(os.sep, '/'),
+            'rows': len(df),
+            'bytes': os.path.getsize(path),
+        }
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            # A manifest rebuilt just now already lists this file
+            if not any(existing['path'] == entry['path'] for existing in manifest):
+                manifest.append(entry)
+            self._write_manifest(manifest)
+        return entry
+
+    def snapshots(self, team=None):
+        """Manifest entries, oldest first, optionally for one team only"""
+        with self._manifest_lock():
+            entries = self._read_manifest()
+        if team is not None:
+            entries = [entry for entry in entries if entry['team'] == team]
+        return sorted(entries, key=lambda entry: entry['scraped_at'])
+
+    def latest(self, team=None):
+        """Manifest entry of the newest snapshot, or None"""
+        entries = self.snapshots(team)
+        return entries[-1] if entries else None
+
+    def load_latest(self, team=None, columns=None):
+        """Load the newest readable snapshot as a DataFrame, or None if there is none"""
+        loaded = self.load_latest_entry(team, columns)
+        return loaded[1] if loaded else None
+
+    def load_latest_entry(self, team=None, columns=None):
+        """
+        (entry, DataFrame) of the newest snapshot that can be read, or None.
+
+        Snapshots whose file is missing or corrupt are skipped in favour
+        of the next older one.
+        """
+        for entry in reversed(self.snapshots(team)):
+            try:
+                return entry, self.load(entry, columns)
+            except (OSError, ValueError, pa.ArrowException):
+                continue
+        return None
+
+    def load_range(self, start, end, team=None, columns=None):
+        """
+        Load every snapshot scraped between `start` and `end` (inclusive).
+
+        `start` / `end` are dates, datetimes or ISO strings; a bare date for
+        `end` covers that whole day. The frames are concatenated with a
+        Scraped_At column added. Returns None when nothing matches.
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        if end == end.normalize():
+            end = end + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+
+        frames = []
+        for entry in self.snapshots(team):
+            scraped_at = pd.Timestamp(entry['scraped_at'])
+            if start <= scraped_at <= end:
+                df = self.load(entry, columns)
+                df['Scraped_At'] = scraped_at
+                frames.append(df)
+
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def load(self, entry, columns=None):
+        """Read one snapshot, memory-mapped, keeping only `columns` if given"""
+        path = os.path.join(self.root, *entry['path'].split('/'))
+        table = pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+        return table.to_pandas()
+
+    def rebuild_manifest(self):
+        """Recreate the manifest from the files on disk"""
+        with self._manifest_lock():
+            entries = self._scan_snapshots()
+            self._write_manifest(entries)
+        return entries
+
+    def _scan_snapshots(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith('.parquet'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                relative_path = os.path.relpath(path, self.root)
+                match = SNAPSHOT_PATH_RE.match(relative_path.replace(os.sep, '/'))
+                if not match:
+                    continue
+                scraped_at = datetime.strptime(f"{match['date']} {match['time']}", '%Y-%m-%d %H%M%S-%f')
+                entries.append({
+                    'team': match['team'],
+                    'scraped_at': scraped_at.isoformat(),
+                    'path': relative_path.replace(os.sep, '/'),
+                    'rows': pq.ParquetFile(path).metadata.num_rows,
+                    'bytes': os.path.getsize(path),
+                })
+        return entries
+
+    def _read_manifest(self):
+        """Manifest entries; call with the manifest lock held"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)['snapshots']
+            if not isinstance(entries, list):
+                raise TypeError('snapshots is not a list')
+            return entries
+        except FileNotFoundError:
+            return []
+        except (ValueError, KeyError, TypeError):
+            # Corrupt or truncated: rebuild it from the Parquet files
+            entries = self._scan_snapshots()
+            self._write_manifest(entries)
+            return entries
+
+    def _write_manifest(self, entries):
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'snapshots': entries}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def _safe_name(name):
+    return re.sub(r'[^\w.-]+', '_', name).strip('_') or 'unknown'
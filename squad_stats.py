@@ -0,0 +1,208 @@
+# squad_stats.py
+import numpy as np
+import pandas as pd
+
+from leaderboard import Ranking, ranking_scores, top_k_positions
+
+# Leaders kept by SquadStats, compared on their ranking column
+LEADER_RANKINGS = {
+    'top_scorer': Ranking('Goals'),
+    'most_experienced': Ranking('Caps'),
+}
+
+
+class SquadStats:
+    """
+    Summary statistics of a set of players as a mergeable aggregate state.
+
+    Counts and sums are kept rather than averages, and each leader is kept
+    as (score, (rank, row), info), so two states combine with merge()
+    without looking at the rows again. Merging is associative and
+    commutative: tied leaders go to the lowest (rank, row), i.e. the
+    earliest row when the frames of increasing `rank` are concatenated,
+    just as from_frame() of that combined frame picks it. A column missing
+    from the frame leaves its sum as None.
+    """
+
+    def __init__(self):
+        self.players = 0
+        self.positions = {}
+        self.caps = None
+        self.goals = None
+        self.age_sum = None
+        self.age_count = 0
+        self.leaders = {}
+
+    @classmethod
+    def from_frame(cls, df, rank=0):
+        """
+        Aggregate state of `df`, computed in one vectorized pass per column.
+
+        `rank` orders `df` among the frames this state is merged with.
+        """
+        state = cls()
+        state.players = len(df)
+
+        if 'Position' in df.columns:
+            codes, uniques = pd.factorize(df['Position'], sort=True)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            state.positions = {position: int(count) for position, count in zip(uniques, counts) if count}
+
+        if 'Caps' in df.columns:
+            state.caps = int(np.nansum(df['Caps'].to_numpy(dtype='float64', na_value=np.nan)))
+        if 'Goals' in df.columns:
+            state.goals = int(np.nansum(df['Goals'].to_numpy(dtype='float64', na_value=np.nan)))
+        if 'Age' in df.columns:
+            ages = df['Age'].to_numpy(dtype='float64', na_value=np.nan)
+            present = ~np.isnan(ages)
+            state.age_sum = float(ages[present].sum())
+            state.age_count = int(present.sum())
+
+        if 'Player' in df.columns:
+            for name, ranking in LEADER_RANKINGS.items():
+                if ranking.column not in df.columns:
+                    continue
+                scores = ranking_scores(df, ranking)
+                best = top_k_positions(scores, 1)
+                if len(best):
+                    row = df.iloc[best[0]]
+                    state.leaders[name] = (scores[best[0]], (rank, int(best[0])), {
+                        'name': row['Player'],
+                        'goals': int(row['Goals']) if 'Goals' in df.columns else 0,
+                        'caps': int(row['Caps']) if 'Caps' in df.columns else 0,
+                    })
+        return state
+
+    def merge(self, other):
+        """New state covering the players of both; neither input is changed"""
+        merged = SquadStats()
+        merged.players = self.players + other.players
+        merged.positions = dict(self.positions)
+        for position, count in other.positions.items():
+            merged.positions[position] = merged.positions.get(position, 0) + count
+        merged.caps = _add(self.caps, other.caps)
+        merged.goals = _add(self.goals, other.goals)
+        merged.age_sum = _add(self.age_sum, other.age_sum)
+        merged.age_count = self.age_count + other.age_count
+
+        merged.leaders = dict(self.leaders)
+        for name, leader in other.leaders.items():
+            # Highest score, ties to the earlier (rank, row)
+            current = merged.leaders.get(name)
+            if current is None or (-leader[0], leader[1]) < (-current[0], current[1]):
+                merged.leaders[name] = leader
+        return merged
+
+    __add__ = merge
+
+    @property
+    def avg_age(self):
+        if self.age_sum is None:
+            return None
+        return self.age_sum / self.age_count if self.age_count else float('nan')
+
+    def to_dict(self):
+        """The stats in get_summary_stats() form"""
+        return {
+            'total_players': self.players,
+            # Most common position first, ties by name
+            'positions': dict(sorted(self.positions.items(), key=lambda item: (-item[1], str(item[0])))),
+            'total_caps': self.caps or 0,
+            'total_goals': self.goals or 0,
+            'avg_age': self.avg_age,
+            'top_scorer': self._leader('top_scorer'),
+            'most_experienced': self._leader('most_experienced'),
+        }
+
+    def _leader(self, name):
+        leader = self.leaders.get(name)
+        return dict(leader[2]) if leader else None
+
+
+def _add(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a + b
+
+
+class TeamStats:
+    """
+    SquadStats of many teams, with the combined stats kept up to date.
+
+    Adding, replacing or removing one team only aggregates that team's
+    rows; the combined stats are a merge of the per-team states. They
+    match get_summary_stats() of the teams' frames concatenated in team
+    order: `team_order` if given, otherwise the order teams were first
+    added in (updating or re-adding a team doesn't move it).
+    """
+
+    def __init__(self, team_order=()):
+        self._teams = {}
+        self._team_rank = {team: rank for rank, team in enumerate(team_order)}
+        self._total = None
+
+    @property
+    def teams(self):
+        return list(self._teams)
+
+    def update(self, df):
+        """Replace the stats of every team in `df`, which needs a Team column"""
+        for team, team_df in df.groupby('Team', sort=False, observed=True):
+            self.update_team(team, team_df)
+
+    def update_team(self, team, df):
+        rank = self._team_rank.setdefault(team, len(self._team_rank))
+        self._teams[team] = SquadStats.from_frame(df, rank)
+        self._total = None
+
+    def remove_team(self, team):
+        self._teams.pop(team, None)
+        self._total = None
+
+    def team(self, team):
+        return self._teams[team]
+
+    def total(self):
+        """SquadStats over all teams"""
+        if self._total is None:
+            total = SquadStats()
+            for state in self._teams.values():
+                total = total.merge(state)
+            self._total = total
+        return self._total
+
+
+def stats_by_group(df, by='Team'):
+    """
+    Summary stats of every group in one groupby pass, as a DataFrame.
+
+    One row per group with players, total_caps, total_goals, avg_age,
+    the top scorer and most experienced player (with their goals / caps)
+    and a player count column per position.
+    """
+    grouped = df.groupby(by, sort=True, observed=True)
+    result = pd.DataFrame({'players': grouped.size()})
+    for col, name in (('Caps', 'total_caps'), ('Goals', 'total_goals')):
+        if col in df.columns:
+            result[name] = grouped[col].sum().astype('int64')
+    if 'Age' in df.columns:
+        result['avg_age'] = grouped['Age'].mean().astype('float64')
+
+    if 'Player' in df.columns:
+        for name, ranking in LEADER_RANKINGS.items():
+            if ranking.column not in df.columns:
+                continue
+            # Stable sort keeps the first of tied players, like idxmax
+            ranked = (df[df[ranking.column].notna()]
+                      .sort_values(ranking.column, ascending=False, kind='stable')
+                      .drop_duplicates(by)
+                      .set_index(by))
+            result[name] = ranked['Player']
+            result[f"{name}_{ranking.column.lower()}"] = ranked[ranking.column]
+
+    if 'Position' in df.columns:
+        positions = grouped['Position'].value_counts().unstack(fill_value=0)
+        result = result.join(positions.loc[:, positions.sum() > 0].astype('int64'))
+    return result
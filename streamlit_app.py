@@ -3,11 +3,20 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import time
 from datetime import datetime
 
 # Import the scraper module
 try:
-    from scraper import scrape_morocco_team_table, get_summary_stats
+    from scraper import (scrape_team_table, get_summary_stats, create_session, add_derived_columns,
+                         apply_schema, MOROCCO_TEAM, MOROCCO_TEAM_URL)
+    from data_loader import StaleWhileRevalidate, VersionedCache, LRUCache, RateLimiter, scrape_flight
+    from filter_index import FilterIndex
+    from name_index import NameIndex
+    from exports import EXPORT_FORMATS, export_bytes
+    from leaderboard import top_k
+    from http_cache import HttpCache
+    from snapshot_store import SnapshotStore
 except ImportError:
     st.error("Error: Could not import scraper module. Make sure scraper.py is in the same directory.")
     st.stop()
@@ -66,26 +75,349 @@ st.markdown("""
         box-shadow: 0 4px 6px rgba(0,0,0,0.1);
         border-left: 5px solid #3B82F6;
     }
-    .stTabs [data-baseweb="tab-list"] {
+    div[role="radiogroup"] {
         gap: 2rem;
     }
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        white-space: pre-wrap;
+    div[role="radiogroup"] label {
         background-color: #F0F2F6;
-        border-radius: 5px 5px 0px 0px;
-        gap: 1px;
-        padding-top: 10px;
-        padding-bottom: 10px;
+        border-radius: 5px;
+        padding: 10px;
     }
 </style>
 """, unsafe_allow_html=True)
 
 
-# Cache the data scraping function
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+# Shared on-disk HTTP cache so a refresh only re-downloads changed pages
+@st.cache_resource
+def get_http_cache():
+    return HttpCache()
+
+
+# One pooled, retrying HTTP session per process, reused across reruns
+@st.cache_resource
+def get_http_session():
+    return create_session()
+
+
+# Every successful scrape is kept as a Parquet snapshot
+@st.cache_resource
+def get_snapshot_store():
+    return SnapshotStore()
+
+
+# Data older than this gets a live refresh in the background
+SNAPSHOT_MAX_AGE = 3600  # 1 hour
+
+# Manual refreshes are allowed at most this often, across all sessions
+MANUAL_REFRESH_INTERVAL = 60  # seconds
+
+# Bounds of the cross-session cache of filter results
+FILTER_CACHE_ENTRIES = 512
+FILTER_CACHE_BYTES = 64 * 1024 * 1024
+
+# Bounds of the cross-session cache of generated downloads
+EXPORT_CACHE_ENTRIES = 32
+EXPORT_CACHE_BYTES = 128 * 1024 * 1024
+
+# Bounds of the cross-session cache of rendered HTML fragments
+HTML_CACHE_ENTRIES = 256
+HTML_CACHE_BYTES = 16 * 1024 * 1024
+
+# Dashboard views
+ROSTER = "📋 Player Roster"
+STATISTICS = "📈 Statistics"
+TOP_PERFORMERS = "🎯 Top Performers"
+CLUB_ANALYSIS = "🏢 Club Analysis"
+DATA_EXPLORER = "📊 Data Explorer"
+SECTIONS = [ROSTER, STATISTICS, TOP_PERFORMERS, CLUB_ANALYSIS, DATA_EXPLORER]
+
+# Bounds of the cross-session cache of built charts (sized by their JSON)
+FIGURE_CACHE_ENTRIES = 256
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def scrape_and_store(http_cache, session, store):
+    """Scrape Wikipedia live, save a snapshot and return (df, scraped_at); raises on failure"""
+    df = scrape_team_table(MOROCCO_TEAM_URL, cache=http_cache, session=session)
+    if df is None:
+        raise ValueError("No players table found on the team page")
+    entry = store.save(df, team=MOROCCO_TEAM)
+    return df, datetime.fromisoformat(entry['scraped_at'])
+
+
+def load_latest_snapshot(store):
+    """(df, scraped_at) of the newest readable local snapshot, or None"""
+    loaded = store.load_latest_entry(MOROCCO_TEAM)
+    if loaded is None:
+        return None
+    entry, df = loaded
+    # Age and Age_Days were computed on the scrape date; bring them up to today
+    return apply_schema(add_derived_columns(df)), datetime.fromisoformat(entry['scraped_at'])
+
+
+# Anything computed from the squad data is cached per data version
+@st.cache_resource
+def get_derived_cache():
+    return VersionedCache()
+
+
+@st.cache_resource
+def get_refresh_limiter():
+    return RateLimiter(MANUAL_REFRESH_INTERVAL)
+
+
+# Filtered rows and metric-card values, shared by every session using the
+# same filters; keys start with the data version, see get_data_loader()
+@st.cache_resource
+def get_filter_result_cache():
+    return LRUCache(
+        max_entries=FILTER_CACHE_ENTRIES,
+        max_bytes=FILTER_CACHE_BYTES,
+        sizeof=lambda result: result['rows'].nbytes
+    )
+
+
+# Built Plotly figures, keyed like filter results plus the chart name
+@st.cache_resource
+def get_figure_cache():
+    return LRUCache(
+        max_entries=FIGURE_CACHE_ENTRIES,
+        max_bytes=FIGURE_CACHE_BYTES,
+        sizeof=lambda entry: entry['bytes'],
+        version_of=filter_key_version
+    )
+
+
+# Generated download files, keyed by filter state and format
+@st.cache_resource
+def get_export_cache():
+    return LRUCache(max_entries=EXPORT_CACHE_ENTRIES, max_bytes=EXPORT_CACHE_BYTES, sizeof=len,
+                    version_of=filter_key_version)
+
+
+# Rendered HTML fragments such as the Top Performers cards
+@st.cache_resource
+def get_html_cache():
+    return LRUCache(
+        max_entries=HTML_CACHE_ENTRIES,
+        max_bytes=HTML_CACHE_BYTES,
+        sizeof=lambda fragments: sum(len(html) for html in fragments.values()),
+        version_of=filter_key_version
+    )
+
+
+def filter_key_version(key):
+    """Data version of a (filter_key, name) cache key"""
+    return key[0][0]
+
+
+# Chart timings of the current rerun, shown in the admin panel
+figure_timings = {'built': 0, 'cached': 0, 'build_seconds': 0.0, 'saved_seconds': 0.0}
+
+
+def cached_figure(filter_key, name, build):
+    """Return the figure `build()` makes for this data version and filter state"""
+    built = []
+
+    def compute():
+        start = time.perf_counter()
+        fig = build()
+        build_seconds = time.perf_counter() - start
+        built.append(build_seconds)
+        return {'figure': fig, 'build_seconds': build_seconds, 'bytes': len(fig.to_json())}
+
+    entry = get_figure_cache().get_or_compute((filter_key, name), compute)
+    if built:
+        figure_timings['built'] += 1
+        figure_timings['build_seconds'] += built[0]
+    else:
+        figure_timings['cached'] += 1
+        figure_timings['saved_seconds'] += entry['build_seconds']
+    return entry['figure']
+
+
+# One stale-while-revalidate loader per process: every session is served
+# the last good data at once, and concurrent refreshes from any session
+# share a single scrape through the process-wide single-flight
+@st.cache_resource
+def get_data_loader():
+    http_cache, session, store = get_http_cache(), get_http_session(), get_snapshot_store()
+    loader = StaleWhileRevalidate(
+        fetch=lambda: scrape_and_store(http_cache, session, store),
+        ttl=SNAPSHOT_MAX_AGE,
+        initial=lambda: load_latest_snapshot(store),
+        flight=scrape_flight,
+        key=MOROCCO_TEAM_URL
+    )
+    # A new data version only evicts what was derived from older versions
+    loader.on_new_version(get_derived_cache().evict_before)
+    for cache in (get_filter_result_cache(), get_figure_cache(), get_export_cache(), get_html_cache()):
+        loader.on_new_version(cache.evict_before)
+    return loader
+
+
 def load_data():
-    return scrape_morocco_team_table()
+    """
+    Return the current squad DataFrame, when it was scraped and its version.
+
+    The dashboard starts from the newest local snapshot instead of waiting
+    on Wikipedia; stale data triggers a live refresh in the background.
+    Only when no snapshot exists yet is the scrape done synchronously, and
+    after a failed one reruns show the error until the loader's retry_after
+    has passed instead of scraping again.
+    """
+    return get_data_loader().get()
+
+
+def compute_filter_options(df):
+    """Sidebar filter choices and slider bounds for one data version"""
+    options = {'positions': sorted(df['Position'].dropna().unique())}
+    for col in ['Caps', 'Goals', 'Age']:
+        if col in df.columns:
+            options[col] = (int(df[col].min()), int(df[col].max()))
+    return options
+
+
+def normalize_filters(value_filters, range_filters):
+    """Hashable, order-independent form of a filter state, for cache keys"""
+    values = tuple(sorted((col, tuple(sorted(set(allowed)))) for col, allowed in value_filters.items()))
+    ranges = tuple(sorted((col, (int(low), int(high))) for col, (low, high) in range_filters.items()))
+    return values, ranges
+
+
+def compute_filter_result(df, filter_index, value_filters, range_filters):
+    """Row positions matching the filters plus the metric-card values"""
+    rows = filter_index.query(value_filters, range_filters)
+    filtered = df.take(rows)
+    return {
+        'rows': rows,
+        'players': len(rows),
+        'total_caps': int(filtered['Caps'].sum()) if 'Caps' in filtered.columns else 0,
+        'total_goals': int(filtered['Goals'].sum()) if 'Goals' in filtered.columns else 0,
+        'avg_age': float(filtered['Age'].mean()) if 'Age' in filtered.columns and len(rows) else 0,
+    }
+
+
+def position_pie(df):
+    position_counts = df['Position'].value_counts().reset_index()
+    position_counts.columns = ['Position', 'Count']
+
+    fig = px.pie(
+        position_counts,
+        values='Count',
+        names='Position',
+        title="Players by Position",
+        color_discrete_sequence=px.colors.sequential.RdBu,
+        hole=0.4
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+
+def age_histogram(df):
+    fig = px.histogram(
+        df,
+        x='Age',
+        nbins=15,
+        title="Age Distribution",
+        color_discrete_sequence=['#3B82F6'],
+        opacity=0.8
+    )
+    fig.update_layout(bargap=0.1)
+    return fig
+
+
+def caps_goals_scatter(df):
+    # Plotly marker sizes don't accept nullable integer columns
+    fig = px.scatter(
+        df.astype({'Caps': 'float64', 'Goals': 'float64'}),
+        x='Caps',
+        y='Goals',
+        size='Goals',
+        color='Position',
+        hover_name='Player',
+        title="Caps vs Goals Analysis",
+        size_max=20,
+        opacity=0.7
+    )
+    fig.update_layout(
+        xaxis_title="Number of Caps",
+        yaxis_title="Number of Goals"
+    )
+    return fig
+
+
+def club_bar(club_counts):
+    fig = px.bar(
+        club_counts.head(10),
+        x='Club',
+        y='Player Count',
+        title="Top 10 Clubs by Player Count",
+        color='Player Count',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(xaxis_tickangle=45)
+    return fig
+
+
+def escape_html(series):
+    return (series.astype(str)
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False))
+
+
+def count_text(series):
+    return series.astype('Int64').astype(str)
+
+
+def player_cards(*lines):
+    """Join per-player Series of HTML lines into one string of player cards"""
+    body = lines[0].str.cat(list(lines[1:]), sep='<br>\n')
+    return ''.join('<div class="player-card">\n' + body + '\n</div>\n')
+
+
+def top_performer_cards(df):
+    """HTML for the three Top Performers columns, keyed by column"""
+    # All three rankings come from one top_k() call; Best Goal Ratio only
+    # counts players with at least 5 caps
+    rankings = top_k(df, k=5)
+    cards = {}
+    if 'top_scorers' in rankings:
+        top = rankings['top_scorers']
+        cards['top_scorers'] = player_cards(
+            '<strong>' + escape_html(top['Player']) + '</strong>',
+            '⚽ ' + count_text(top['Goals']) + ' goals | 👕 ' + count_text(top['Caps']) + ' caps',
+            '🏢 ' + escape_html(top['Club'])
+        )
+    if 'most_caps' in rankings:
+        top = rankings['most_caps']
+        cards['most_caps'] = player_cards(
+            '<strong>' + escape_html(top['Player']) + '</strong>',
+            '👕 ' + count_text(top['Caps']) + ' caps | ⚽ ' + count_text(top['Goals']) + ' goals',
+            '🏢 ' + escape_html(top['Club'])
+        )
+    if 'best_ratio' in rankings:
+        top = rankings['best_ratio']
+        cards['best_ratio'] = player_cards(
+            '<strong>' + escape_html(top['Player']) + '</strong>',
+            '📈 ' + top['Goal_Ratio'].map('{:.2f}'.format) + ' goals/cap',
+            '⚽ ' + count_text(top['Goals']) + ' goals in ' + count_text(top['Caps']) + ' caps'
+        )
+    return cards
+
+
+def format_age(scraped_at):
+    """Human-readable age of the data, e.g. '5 min ago'"""
+    seconds = max(0, int((datetime.now() - scraped_at).total_seconds()))
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{seconds // 60} min ago"
+    if seconds < 86400:
+        return f"{seconds // 3600} h ago"
+    days = seconds // 86400
+    return f"{days} day{'s' if days > 1 else ''} ago"
 
 
 # Sidebar
@@ -96,20 +428,31 @@ with st.sidebar:
 
     # Refresh button
     if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
+        allowed, retry_in = get_refresh_limiter().try_acquire()
+        if allowed:
+            with st.spinner("Fetching latest data from Wikipedia..."):
+                get_data_loader().refresh()
+            st.rerun()
+        else:
+            st.info(f"Data was refreshed moments ago. Try again in {int(retry_in) + 1} s.")
 
     st.markdown("---")
 
     # Filters
     st.subheader("🔍 Filters")
 
-    # Load data first for filters
-    df = load_data()
+    # Load data first for filters; the main view reuses it, so each rerun
+    # asks the loader once
+    with st.spinner("Loading team data..."):
+        df, scraped_at, data_version = load_data()
 
     if df is not None:
+        filter_options = get_derived_cache().get_or_compute(
+            data_version, 'filter_options', lambda: compute_filter_options(df)
+        )
+
         # Position filter
-        positions = sorted(df['Position'].unique())
+        positions = filter_options['positions']
         selected_positions = st.multiselect(
             "Select Positions",
             positions,
@@ -118,31 +461,19 @@ with st.sidebar:
         )
 
         # Caps range filter
-        if 'Caps' in df.columns:
-            min_caps, max_caps = st.slider(
-                "Caps Range",
-                int(df['Caps'].min()),
-                int(df['Caps'].max()),
-                (0, int(df['Caps'].max()))
-            )
+        if 'Caps' in filter_options:
+            caps_low, caps_high = filter_options['Caps']
+            min_caps, max_caps = st.slider("Caps Range", caps_low, caps_high, (0, caps_high))
 
         # Goals range filter
-        if 'Goals' in df.columns:
-            min_goals, max_goals = st.slider(
-                "Goals Range",
-                int(df['Goals'].min()),
-                int(df['Goals'].max()),
-                (0, int(df['Goals'].max()))
-            )
+        if 'Goals' in filter_options:
+            goals_low, goals_high = filter_options['Goals']
+            min_goals, max_goals = st.slider("Goals Range", goals_low, goals_high, (0, goals_high))
 
         # Age filter (if available)
-        if 'Age' in df.columns:
-            min_age, max_age = st.slider(
-                "Age Range",
-                int(df['Age'].min()),
-                int(df['Age'].max()),
-                (int(df['Age'].min()), int(df['Age'].max()))
-            )
+        if 'Age' in filter_options:
+            age_low, age_high = filter_options['Age']
+            min_age, max_age = st.slider("Age Range", age_low, age_high, (age_low, age_high))
 
     st.markdown("---")
 
@@ -154,32 +485,69 @@ with st.sidebar:
     - Click refresh to get latest data
     """)
 
+    # Background refresh status
+    refresh_status = get_data_loader().status()
+    if refresh_status['state'] == 'refreshing':
+        st.caption("⏳ Refreshing data in the background...")
+    elif refresh_status['state'] == 'failed':
+        st.warning(f"Last refresh failed, showing previous data.\n\n{refresh_status['last_error']}")
+    elif refresh_status['last_success']:
+        st.caption(f"✅ Last refreshed at {refresh_status['last_success'].strftime('%H:%M:%S')}")
+
+    # Cache health, shared by all sessions of this server process
+    with st.expander("🛠️ Admin"):
+        filter_cache = get_filter_result_cache()
+        st.caption(
+            f"Filter cache: {len(filter_cache)} entries, {filter_cache.bytes / 1024:,.1f} KiB, "
+            f"hit rate {filter_cache.hit_rate:.0%} "
+            f"({filter_cache.stats['hits']} hits / {filter_cache.stats['misses']} misses, "
+            f"{filter_cache.stats['evictions']} evicted)"
+        )
+        figure_cache = get_figure_cache()
+        st.caption(
+            f"Chart cache: {len(figure_cache)} entries, {figure_cache.bytes / 1024:,.1f} KiB, "
+            f"hit rate {figure_cache.hit_rate:.0%}"
+        )
+        # Filled in at the end of the rerun, once every chart has been drawn
+        figure_timing_slot = st.empty()
+        st.caption(f"Data version {get_data_loader().version}, {len(get_derived_cache())} derived entries")
+
 # Main content
 st.markdown('<h1 class="main-header">🇲🇦 Morocco National Football Team Dashboard</h1>', unsafe_allow_html=True)
 
-# Load data with spinner
-with st.spinner("Loading team data..."):
-    df = load_data()
-
 if df is None:
     st.error("❌ Failed to load data. Please check your internet connection and try again.")
     st.stop()
 
 # Apply filters
 if 'df' in locals():
-    filtered_df = df.copy()
+    # Indexes are built once per data version; a query returns row positions
+    filter_index = get_derived_cache().get_or_compute(
+        data_version, 'filter_index', lambda: FilterIndex(df)
+    )
 
+    value_filters = {}
     if 'selected_positions' in locals() and selected_positions:
-        filtered_df = filtered_df[filtered_df['Position'].isin(selected_positions)]
-
-    if 'min_caps' in locals() and 'max_caps' in locals() and 'Caps' in filtered_df.columns:
-        filtered_df = filtered_df[(filtered_df['Caps'] >= min_caps) & (filtered_df['Caps'] <= max_caps)]
-
-    if 'min_goals' in locals() and 'max_goals' in locals() and 'Goals' in filtered_df.columns:
-        filtered_df = filtered_df[(filtered_df['Goals'] >= min_goals) & (filtered_df['Goals'] <= max_goals)]
+        value_filters['Position'] = selected_positions
+
+    range_filters = {}
+    if 'min_caps' in locals() and 'max_caps' in locals():
+        range_filters['Caps'] = (min_caps, max_caps)
+    if 'min_goals' in locals() and 'max_goals' in locals():
+        range_filters['Goals'] = (min_goals, max_goals)
+    if 'min_age' in locals() and 'max_age' in locals():
+        range_filters['Age'] = (min_age, max_age)
+
+    filter_key = (data_version, normalize_filters(value_filters, range_filters))
+    filter_result = get_filter_result_cache().get_or_compute(
+        filter_key,
+        lambda: compute_filter_result(df, filter_index, value_filters, range_filters)
+    )
+    filtered_df = df.take(filter_result['rows'])
 
-    if 'min_age' in locals() and 'max_age' in locals() and 'Age' in filtered_df.columns:
-        filtered_df = filtered_df[(filtered_df['Age'] >= min_age) & (filtered_df['Age'] <= max_age)]
+    # Drop categories only filtered-out players had, so charts and counts skip them
+    for col in filtered_df.select_dtypes('category').columns:
+        filtered_df[col] = filtered_df[col].cat.remove_unused_categories()
 
 # Display key metrics
 st.markdown('<h2 class="sub-header">📊 Team Overview</h2>', unsafe_allow_html=True)
@@ -193,45 +561,37 @@ with col1:
         <div class="metric-value">{:,}</div>
         <div class="metric-label">Total Players</div>
     </div>
-    """.format(len(filtered_df)), unsafe_allow_html=True)
+    """.format(filter_result['players']), unsafe_allow_html=True)
 
 with col2:
-    total_caps = int(filtered_df['Caps'].sum()) if 'Caps' in filtered_df.columns else 0
     st.markdown("""
     <div class="metric-card">
         <div class="metric-value">{:,}</div>
         <div class="metric-label">Total Caps</div>
     </div>
-    """.format(total_caps), unsafe_allow_html=True)
+    """.format(filter_result['total_caps']), unsafe_allow_html=True)
 
 with col3:
-    total_goals = int(filtered_df['Goals'].sum()) if 'Goals' in filtered_df.columns else 0
     st.markdown("""
     <div class="metric-card">
         <div class="metric-value">{:,}</div>
         <div class="metric-label">Total Goals</div>
     </div>
-    """.format(total_goals), unsafe_allow_html=True)
+    """.format(filter_result['total_goals']), unsafe_allow_html=True)
 
 with col4:
-    avg_age = float(filtered_df['Age'].mean()) if 'Age' in filtered_df.columns else 0
     st.markdown("""
     <div class="metric-card">
         <div class="metric-value">{:.1f}</div>
         <div class="metric-label">Average Age</div>
     </div>
-    """.format(avg_age), unsafe_allow_html=True)
-
-# Create tabs for different views
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📋 Player Roster",
-    "📈 Statistics",
-    "🎯 Top Performers",
-    "🏢 Club Analysis",
-    "📊 Data Explorer"
-])
-
-with tab1:
+    """.format(filter_result['avg_age']), unsafe_allow_html=True)
+
+# One view at a time: unlike st.tabs, only the selected section's code runs
+# on a rerun, so typing in the roster search doesn't rebuild charts or exports
+section = st.radio("View", SECTIONS, horizontal=True, label_visibility="collapsed", key="section")
+
+if section == ROSTER:
     st.markdown('<h3 class="sub-header">Player Roster</h3>', unsafe_allow_html=True)
 
     # Search functionality
@@ -240,10 +600,15 @@ with tab1:
         search_query = st.text_input("Search players by name:", "",
                                      placeholder="Type player name to search...")
 
-    # Display filtered data
-    display_df = filtered_df.copy()
+    # Display filtered data; the search is answered from a per-version
+    # name index that ignores accents and tolerates small typos
+    display_df = filtered_df
     if search_query:
-        display_df = display_df[display_df['Player'].str.contains(search_query, case=False, na=False)]
+        name_index = get_derived_cache().get_or_compute(
+            data_version, 'name_index', lambda: NameIndex(df['Player'])
+        )
+        matches = pd.Index(filter_result['rows']).get_indexer(name_index.search(search_query))
+        display_df = filtered_df.iloc[matches[matches >= 0]]
 
     # Select columns to display
     default_cols = ['Number', 'Position', 'Player', 'Age', 'Caps', 'Goals', 'Club']
@@ -264,7 +629,7 @@ with tab1:
         }
     )
 
-with tab2:
+if section == STATISTICS:
     st.markdown('<h3 class="sub-header">Team Statistics</h3>', unsafe_allow_html=True)
 
     col1, col2 = st.columns(2)
@@ -272,103 +637,46 @@ with tab2:
     with col1:
         # Position distribution pie chart
         if 'Position' in filtered_df.columns:
-            position_counts = filtered_df['Position'].value_counts().reset_index()
-            position_counts.columns = ['Position', 'Count']
-
-            fig1 = px.pie(
-                position_counts,
-                values='Count',
-                names='Position',
-                title="Players by Position",
-                color_discrete_sequence=px.colors.sequential.RdBu,
-                hole=0.4
-            )
-            fig1.update_traces(textposition='inside', textinfo='percent+label')
+            fig1 = cached_figure(filter_key, 'position_pie', lambda: position_pie(filtered_df))
             st.plotly_chart(fig1, use_container_width=True)
 
     with col2:
         # Age distribution histogram
         if 'Age' in filtered_df.columns:
-            fig2 = px.histogram(
-                filtered_df,
-                x='Age',
-                nbins=15,
-                title="Age Distribution",
-                color_discrete_sequence=['#3B82F6'],
-                opacity=0.8
-            )
-            fig2.update_layout(bargap=0.1)
+            fig2 = cached_figure(filter_key, 'age_histogram', lambda: age_histogram(filtered_df))
             st.plotly_chart(fig2, use_container_width=True)
 
     # Caps vs Goals scatter plot
     if all(col in filtered_df.columns for col in ['Caps', 'Goals']):
-        fig3 = px.scatter(
-            filtered_df,
-            x='Caps',
-            y='Goals',
-            size='Goals',
-            color='Position',
-            hover_name='Player',
-            title="Caps vs Goals Analysis",
-            size_max=20,
-            opacity=0.7
-        )
-        fig3.update_layout(
-            xaxis_title="Number of Caps",
-            yaxis_title="Number of Goals"
-        )
+        fig3 = cached_figure(filter_key, 'caps_goals_scatter', lambda: caps_goals_scatter(filtered_df))
         st.plotly_chart(fig3, use_container_width=True)
 
-with tab3:
+if section == TOP_PERFORMERS:
     st.markdown('<h3 class="sub-header">Top Performers</h3>', unsafe_allow_html=True)
 
+    # Each column's cards are one HTML string, sent as a single element
+    cards = get_html_cache().get_or_compute(
+        (filter_key, 'top_performers'), lambda: top_performer_cards(filtered_df)
+    )
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.subheader("🏆 Top Scorers")
-        if 'Goals' in filtered_df.columns:
-            top_scorers = filtered_df.nlargest(5, 'Goals')[['Player', 'Goals', 'Caps', 'Club']]
-            for idx, row in top_scorers.iterrows():
-                with st.container():
-                    st.markdown(f"""
-                    <div class="player-card">
-                        <strong>{row['Player']}</strong><br>
-                        ⚽ {int(row['Goals'])} goals | 👕 {int(row['Caps'])} caps<br>
-                        🏢 {row['Club']}
-                    </div>
-                    """, unsafe_allow_html=True)
+        if 'top_scorers' in cards:
+            st.markdown(cards['top_scorers'], unsafe_allow_html=True)
 
     with col2:
         st.subheader("🎖️ Most Experienced")
-        if 'Caps' in filtered_df.columns:
-            most_caps = filtered_df.nlargest(5, 'Caps')[['Player', 'Caps', 'Goals', 'Club']]
-            for idx, row in most_caps.iterrows():
-                with st.container():
-                    st.markdown(f"""
-                    <div class="player-card">
-                        <strong>{row['Player']}</strong><br>
-                        👕 {int(row['Caps'])} caps | ⚽ {int(row['Goals'])} goals<br>
-                        🏢 {row['Club']}
-                    </div>
-                    """, unsafe_allow_html=True)
+        if 'most_caps' in cards:
+            st.markdown(cards['most_caps'], unsafe_allow_html=True)
 
     with col3:
         st.subheader("📊 Best Goal Ratio")
-        if all(col in filtered_df.columns for col in ['Caps', 'Goals']):
-            filtered_df['Goal_Ratio'] = filtered_df['Goals'] / filtered_df['Caps'].replace(0, 1)
-            best_ratio = filtered_df[filtered_df['Caps'] >= 5].nlargest(5, 'Goal_Ratio')[
-                ['Player', 'Goal_Ratio', 'Goals', 'Caps']]
-            for idx, row in best_ratio.iterrows():
-                with st.container():
-                    st.markdown(f"""
-                    <div class="player-card">
-                        <strong>{row['Player']}</strong><br>
-                        📈 {row['Goal_Ratio']:.2f} goals/cap<br>
-                        ⚽ {int(row['Goals'])} goals in {int(row['Caps'])} caps
-                    </div>
-                    """, unsafe_allow_html=True)
-
-with tab4:
+        if 'best_ratio' in cards:
+            st.markdown(cards['best_ratio'], unsafe_allow_html=True)
+
+if section == CLUB_ANALYSIS:
     st.markdown('<h3 class="sub-header">Club Analysis</h3>', unsafe_allow_html=True)
 
     if 'Club' in filtered_df.columns:
@@ -379,15 +687,7 @@ with tab4:
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            fig4 = px.bar(
-                club_counts.head(10),
-                x='Club',
-                y='Player Count',
-                title="Top 10 Clubs by Player Count",
-                color='Player Count',
-                color_continuous_scale='Viridis'
-            )
-            fig4.update_layout(xaxis_tickangle=45)
+            fig4 = cached_figure(filter_key, 'club_bar', lambda: club_bar(club_counts))
             st.plotly_chart(fig4, use_container_width=True)
 
         with col2:
@@ -402,7 +702,7 @@ with tab4:
                 }
             )
 
-with tab5:
+if section == DATA_EXPLORER:
     st.markdown('<h3 class="sub-header">Data Explorer</h3>', unsafe_allow_html=True)
 
     # Show raw data with option to select columns
@@ -431,35 +731,46 @@ with tab5:
     col1, col2 = st.columns(2)
 
     with col1:
-        # Download as CSV
-        csv = filtered_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv,
-            file_name=f"morocco_team_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            use_container_width=True
+        export_format = st.selectbox(
+            "Format",
+            list(EXPORT_FORMATS),
+            format_func=lambda fmt: EXPORT_FORMATS[fmt]['label']
         )
 
+    # Files are only generated when asked for, then shared by every session
+    # exporting the same data version, filters and format
+    export_key = (filter_key, export_format)
     with col2:
-        # Download as JSON
-        json_data = filtered_df.to_json(orient='records', indent=2)
-        st.download_button(
-            label="📥 Download JSON",
-            data=json_data,
-            file_name=f"morocco_team_{datetime.now().strftime('%Y%m%d')}.json",
-            mime="application/json",
-            use_container_width=True
-        )
+        if st.button("⚙️ Prepare Download", use_container_width=True):
+            st.session_state['export_key'] = export_key
+
+        if st.session_state.get('export_key') == export_key:
+            export_data = get_export_cache().get_or_compute(
+                export_key, lambda: export_bytes(filtered_df, export_format)
+            )
+            export_info = EXPORT_FORMATS[export_format]
+            st.download_button(
+                label=f"📥 Download {export_info['label']}",
+                data=export_data,
+                file_name=f"morocco_team_{datetime.now().strftime('%Y%m%d')}.{export_info['extension']}",
+                mime=export_info['mime'],
+                use_container_width=True
+            )
 
 # Footer
 st.markdown("---")
 st.markdown(
     f"""
     <div style='text-align: center; color: #666; font-size: 0.9rem; padding: 1rem;'>
-        Data sourced from Wikipedia • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • 
+        Data sourced from Wikipedia • Scraped {format_age(scraped_at)} ({scraped_at.strftime('%Y-%m-%d %H:%M:%S')}) • 
         Showing {len(filtered_df)} of {len(df)} players
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+figure_timing_slot.caption(
+    f"Charts this rerun: {figure_timings['cached']} cached, {figure_timings['built']} built "
+    f"in {figure_timings['build_seconds'] * 1000:.0f} ms, "
+    f"~{figure_timings['saved_seconds'] * 1000:.0f} ms saved"
+)
@@ -0,0 +1,173 @@
+# conftest.py
+import hashlib
+import http.server
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAMS = list('ABCDEF')
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+sys.path.insert(0, ROOT)
+
+import scraper  # noqa: E402
+from fixture_store import FIXTURE_DIR_ENV, FIXTURE_MODE_ENV  # noqa: E402
+
+
+def page_path(title):
+    return os.path.join(PAGES_DIR, title + '.html')
+
+
+def read_page(title):
+    with open(page_path(title), 'rb') as f:
+        return f.read()
+
+
+def make_squads(rows_per_team=12, seed=0):
+    """
+    Synthetic squads for TEAMS in the dashboard's dtypes.
+
+    Caps and goals take only a few distinct values, so most leader and
+    top-k lists end in ties.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(TEAMS) * rows_per_team
+    caps = rng.integers(0, 8, n)
+    goals = rng.integers(0, 3, n)
+    return scraper.apply_schema(pd.DataFrame({
+        'Team': np.repeat(TEAMS, rows_per_team),
+        'Player': [f"p{i}" for i in range(n)],
+        'Position': rng.choice(['GK', 'DF', 'MF', 'FW'], n),
+        'Club': rng.choice(['Club 1', 'Club 2', 'Club 3'], n),
+        'Caps': caps,
+        'Goals': goals,
+        'Age': rng.integers(18, 36, n),
+        'Goal_Ratio': np.where(caps > 0, goals / np.maximum(caps, 1), 0.0),
+    }))
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves tests/pages/<title>.html at /wiki/<title>.
+
+    Class attributes (set per server by the stub_server fixture) inject
+    latency, a run of failing responses and ETag revalidation.
+    """
+
+    delay = 0
+    fail_first = 0
+    fail_status = 503
+    fail_headers = {}
+    use_etag = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            failing = self.fail_first > 0
+            if failing:
+                type(self).fail_first -= 1
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        if failing:
+            self.send_response(self.fail_status)
+            for name, value in self.fail_headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        title = self.path.rsplit('/', 1)[-1]
+        try:
+            body = read_page(title)
+        except OSError:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.use_etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        if self.use_etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        handler = type('Handler', (StubHandler,), {})
+        super().__init__(('127.0.0.1', 0), handler)
+        self.handler = handler
+        self.lock = threading.Lock()
+        self.requests = []
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}/wiki/"
+
+    def url(self, title):
+        return self.base_url + title
+
+    def configure(self, **attrs):
+        for name, value in attrs.items():
+            setattr(self.handler, name, value)
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_port_url():
+    """URL of a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/wiki/Nowhere"
+
+
+@pytest.fixture
+def fast_session():
+    """ScraperSession with short timeouts and near-zero backoff"""
+    session = scraper.create_session(timeout=2, max_retries=2, backoff_factor=0.001)
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def _no_fixture_env(monkeypatch):
+    """Tests talk to the stub server unless they set up fixtures themselves"""
+    monkeypatch.delenv(FIXTURE_MODE_ENV, raising=False)
+    monkeypatch.delenv(FIXTURE_DIR_ENV, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _clear_table_signatures():
+    scraper.clear_table_signatures()
+    yield
+    scraper.clear_table_signatures()
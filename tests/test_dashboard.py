@@ -0,0 +1,103 @@
+# test_dashboard.py
+import contextlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import scraper
+from conftest import ROOT, read_page
+from snapshot_store import SnapshotStore
+
+st = pytest.importorskip('streamlit')
+AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+
+MOROCCO = 'Morocco_national_football_team'
+
+
+@pytest.fixture
+def app(stub_server, tmp_path, monkeypatch):
+    """The dashboard scraping the stub server, with its caches and snapshots in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scraper, 'MOROCCO_TEAM_URL', stub_server.url(MOROCCO))
+    # AppTest can't render these in this Streamlit version
+    monkeypatch.setattr(st, 'spinner', lambda *args, **kwargs: contextlib.nullcontext())
+    monkeypatch.setattr(st, 'container', lambda *args, **kwargs: contextlib.nullcontext())
+    st.cache_resource.clear()
+    yield AppTest.from_file(os.path.join(ROOT, 'streamlit_app.py'), default_timeout=60)
+    st.cache_resource.clear()
+
+
+def squad():
+    return scraper.parse_players_table(read_page(MOROCCO))
+
+
+def shown_by_default(df):
+    # The default Caps range leaves out the player without caps
+    return df[df['Caps'].notna()]
+
+
+def scrape_requests(stub_server):
+    return sum(path.endswith(MOROCCO) for path in stub_server.requests)
+
+
+def shown_frame(app):
+    return app.dataframe[0].value
+
+
+def test_loads_from_a_live_scrape(app, stub_server):
+    app.run()
+    assert not app.exception
+    assert len(shown_frame(app)) == len(shown_by_default(squad()))
+    assert scrape_requests(stub_server) == 1
+
+
+def test_unreadable_newest_snapshot_falls_back_to_an_older_one(app, stub_server, tmp_path):
+    stub_server.configure(fail_first=100, fail_status=404)
+    store = SnapshotStore(str(tmp_path / 'snapshots'))
+    df = squad()
+    store.save(df.head(5), scraper.MOROCCO_TEAM, datetime.now() - timedelta(minutes=2))
+    newest = store.save(df, scraper.MOROCCO_TEAM, datetime.now() - timedelta(minutes=1))
+    os.remove(tmp_path / 'snapshots' / newest['path'])
+
+    app.run()
+
+    assert not app.exception
+    assert len(shown_frame(app)) == 5
+    assert scrape_requests(stub_server) == 0
+
+
+def test_corrupt_only_snapshot_falls_back_to_a_scrape(app, stub_server, tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshots'))
+    entry = store.save(squad(), scraper.MOROCCO_TEAM)
+    with open(tmp_path / 'snapshots' / entry['path'], 'wb') as f:
+        f.write(b'not parquet')
+
+    app.run()
+
+    assert not app.exception
+    assert len(shown_frame(app)) == len(shown_by_default(squad()))
+    assert scrape_requests(stub_server) == 1
+
+
+def test_snapshot_ages_are_recomputed(app, stub_server, tmp_path):
+    df = squad()
+    df['Age'] = 99
+    SnapshotStore(str(tmp_path / 'snapshots')).save(df, scraper.MOROCCO_TEAM)
+
+    app.run()
+
+    assert not app.exception
+    assert shown_frame(app)['Age'].tolist() == shown_by_default(squad())['Age'].tolist()
+    assert scrape_requests(stub_server) == 0
+
+
+def test_failed_scrape_is_not_repeated_on_every_rerun(app, stub_server):
+    stub_server.configure(fail_first=100, fail_status=404)
+
+    for _ in range(3):
+        app.run()
+        assert not app.exception
+        assert any('Failed to load data' in error.value for error in app.error)
+
+    assert scrape_requests(stub_server) == 1
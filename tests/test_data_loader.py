@@ -0,0 +1,177 @@
+# test_data_loader.py
+import threading
+import time
+from datetime import datetime
+
+from data_loader import LRUCache, SingleFlight, StaleWhileRevalidate, VersionedCache
+
+
+class CountingFetch:
+    def __init__(self, delay=0.05, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"value {call}", datetime.now()
+
+
+def run_threads(target, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_cold_load_from_many_threads_fetches_once():
+    fetch = CountingFetch()
+    loader = StaleWhileRevalidate(fetch, ttl=3600)
+
+    results = run_threads(loader.get, 32)
+
+    assert fetch.calls == 1
+    assert {(loaded.value, loaded.version) for loaded in results} == {('value 1', 1)}
+
+
+def test_descheduled_cold_caller_does_not_fetch_again():
+    fetch = CountingFetch(delay=0)
+    resume = threading.Event()
+
+    class PausingLoader(StaleWhileRevalidate):
+        # Stall the 'late' thread right after it has seen that there is no value
+        def _notify(self, version):
+            if threading.current_thread().name == 'late':
+                resume.wait(10)
+            super()._notify(version)
+
+    loader = PausingLoader(fetch, ttl=3600)
+    late_result = []
+    late = threading.Thread(target=lambda: late_result.append(loader.get()), name='late')
+    late.start()
+    time.sleep(0.05)
+
+    first = loader.get()
+    resume.set()
+    late.join(10)
+
+    assert fetch.calls == 1
+    assert first.version == late_result[0].version == 1
+
+
+def test_failed_cold_load_is_shared_then_retried():
+    fetch = CountingFetch(error=RuntimeError('down'))
+    loader = StaleWhileRevalidate(fetch, ttl=3600, retry_after=0)
+
+    results = run_threads(loader.get, 16)
+    assert fetch.calls == 1
+    assert all(loaded.value is None for loaded in results)
+    assert loader.status()['last_error'] == 'RuntimeError: down'
+
+    fetch.error = None
+    assert loader.get().value == 'value 2'
+
+
+def test_new_version_notifies_once_per_swap():
+    fetch = CountingFetch(delay=0.02)
+    loader = StaleWhileRevalidate(fetch, ttl=3600, flight=SingleFlight())
+    versions = []
+    loader.on_new_version(versions.append)
+
+    run_threads(loader.get, 8)
+    run_threads(loader.refresh, 8)
+
+    assert versions == list(range(1, loader.version + 1))
+    assert loader.version == fetch.calls
+
+
+def test_lru_evict_before_drops_older_versions():
+    cache = LRUCache(max_entries=10, sizeof=len)
+    for version in (1, 2, 3):
+        cache.put((version, 'filters'), 'x' * version)
+
+    cache.evict_before(3)
+
+    assert len(cache) == 1
+    assert cache.bytes == 3
+    assert cache.get_or_compute((3, 'filters'), lambda: 'recomputed') == 'xxx'
+
+
+def test_lru_evict_before_with_nested_keys():
+    cache = LRUCache(version_of=lambda key: key[0][0])
+    cache.put(((1, 'filters'), 'position_pie'), 'old')
+    cache.put(((2, 'filters'), 'position_pie'), 'new')
+
+    cache.evict_before(2)
+
+    assert cache.get_or_compute(((2, 'filters'), 'position_pie'), lambda: None) == 'new'
+    assert cache.get_or_compute(((1, 'filters'), 'position_pie'), lambda: 'rebuilt') == 'rebuilt'
+
+
+def test_new_version_evicts_registered_lru():
+    loader = StaleWhileRevalidate(CountingFetch(delay=0), ttl=3600)
+    cache = LRUCache()
+    loader.on_new_version(cache.evict_before)
+
+    first = loader.get()
+    cache.put((first.version, 'filters'), 'rows')
+    loader.refresh()
+    cache.put((loader.version, 'filters'), 'rows')
+
+    assert len(cache) == 1
+
+
+def test_failing_seed_falls_back_to_a_fetch():
+    def broken_snapshot():
+        raise FileNotFoundError('snapshot.parquet')
+
+    fetch = CountingFetch(delay=0)
+    loader = StaleWhileRevalidate(fetch, ttl=3600, initial=broken_snapshot)
+
+    loaded = loader.get()
+    assert (loaded.value, loaded.version) == ('value 1', 1)
+    assert loader.status()['state'] == 'fresh'
+
+
+def test_cold_load_backs_off_after_a_failure():
+    fetch = CountingFetch(delay=0, error=RuntimeError('down'))
+    loader = StaleWhileRevalidate(fetch, ttl=3600, retry_after=60)
+
+    results = [loader.get() for _ in range(5)]
+    assert fetch.calls == 1
+    assert all(loaded.value is None for loaded in results)
+    assert loader.status()['state'] == 'failed'
+
+    # An explicit refresh still fetches right away
+    fetch.error = None
+    assert loader.refresh()
+    assert loader.get().value == 'value 2'
+
+
+def test_versioned_cache_builds_once_for_concurrent_sessions():
+    build = CountingFetch()
+    cache = VersionedCache()
+
+    results = run_threads(lambda: cache.get_or_compute(1, 'name_index', build), 16)
+
+    assert build.calls == 1
+    assert len({id(result) for result in results}) == 1
+    # Other keys and versions still get their own build
+    cache.get_or_compute(1, 'filter_index', build)
+    cache.get_or_compute(2, 'name_index', build)
+    assert build.calls == 3
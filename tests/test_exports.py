@@ -0,0 +1,87 @@
+# test_exports.py
+import gzip
+import io
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import scraper
+from conftest import read_page
+from exports import EXPORT_FORMATS, export_bytes
+
+PAGES = ['Morocco_national_football_team', 'Egypt_national_football_team']
+# Several full chunks plus a short last one
+CHUNK_ROWS = 8
+
+
+@pytest.fixture(scope='module')
+def squads():
+    frames = [scraper.parse_players_table(read_page(title)) for title in PAGES]
+    df = scraper.apply_schema(pd.concat(frames, ignore_index=True))
+    # Quoting and a missing position must survive chunk boundaries too
+    df.loc[CHUNK_ROWS, 'Player'] = 'Smith, "Junior"\nII'
+    df.loc[CHUNK_ROWS + 1, 'Position'] = None
+    assert len(df) > 3 * CHUNK_ROWS and len(df) % CHUNK_ROWS
+    return df
+
+
+def test_csv_matches_to_csv(squads):
+    assert export_bytes(squads, 'csv', CHUNK_ROWS) == squads.to_csv(index=False).encode('utf-8')
+
+
+def test_gzip_csv_decompresses_to_the_csv(squads):
+    data = export_bytes(squads, 'csv.gz', CHUNK_ROWS)
+    assert gzip.decompress(data) == export_bytes(squads, 'csv', CHUNK_ROWS)
+    # Fixed mtime: identical data gives identical bytes
+    assert export_bytes(squads, 'csv.gz', CHUNK_ROWS) == data
+
+
+def test_json_matches_to_json(squads):
+    expected = squads.to_json(orient='records', indent=2).encode('utf-8')
+    assert export_bytes(squads, 'json', CHUNK_ROWS) == expected
+
+
+@pytest.mark.parametrize('chunk_rows', [1, CHUNK_ROWS, 10_000])
+def test_chunk_size_does_not_change_the_output(squads, chunk_rows):
+    for fmt in ('csv', 'json'):
+        assert export_bytes(squads, fmt, chunk_rows) == export_bytes(squads, fmt)
+
+
+def test_parquet_round_trips_dtypes(squads):
+    data = export_bytes(squads, 'parquet', CHUNK_ROWS)
+    assert pq.ParquetFile(io.BytesIO(data)).metadata.num_row_groups > 1
+
+    restored = pd.read_parquet(io.BytesIO(data))
+    assert restored['Position'].dtype == 'category'
+    assert restored['Caps'].dtype == 'Int16'
+    assert restored['Caps'].isna().any()
+    pd.testing.assert_frame_equal(restored, squads.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'json'])
+def test_empty_frame(squads, fmt):
+    empty = squads.iloc[:0]
+    data = export_bytes(empty, fmt, CHUNK_ROWS)
+    if fmt == 'csv.gz':
+        data = gzip.decompress(data)
+    if fmt == 'json':
+        assert data == empty.to_json(orient='records', indent=2).encode('utf-8')
+        assert json.loads(data) == []
+    else:
+        assert data == empty.to_csv(index=False).encode('utf-8')
+
+
+def test_empty_frame_parquet_keeps_columns(squads):
+    empty = squads.iloc[:0]
+    restored = pd.read_parquet(io.BytesIO(export_bytes(empty, 'parquet', CHUNK_ROWS)))
+    assert list(restored.columns) == list(empty.columns)
+    assert len(restored) == 0
+    assert restored['Caps'].dtype == 'Int16'
+
+
+def test_unknown_format_is_rejected(squads):
+    assert 'xlsx' not in EXPORT_FORMATS
+    with pytest.raises(ValueError, match='xlsx'):
+        export_bytes(squads, 'xlsx')
@@ -0,0 +1,88 @@
+# test_filter_index.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import scraper
+from conftest import read_page
+from filter_index import FilterIndex
+
+PAGES = ['Morocco_national_football_team', 'Senegal_national_football_team',
+         'Egypt_national_football_team', 'Tunisia_national_football_team']
+
+
+def mask_chain(df, values=None, ranges=None):
+    """The isin / between filtering the dashboard did before FilterIndex"""
+    mask = pd.Series(True, index=df.index)
+    for col, allowed in (values or {}).items():
+        if allowed:
+            mask &= df[col].isin(allowed)
+    for col, (low, high) in (ranges or {}).items():
+        mask &= df[col].between(low, high).fillna(False).astype(bool)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.fixture(scope='module')
+def squads():
+    frames = [scraper.parse_players_table(read_page(title)) for title in PAGES]
+    df = scraper.apply_schema(pd.concat(frames, ignore_index=True))
+    # Missing values in every filtered column
+    df.loc[[0, 30], 'Position'] = np.nan
+    df.loc[[1, 31, 60], 'Caps'] = pd.NA
+    df.loc[[2, 61], 'Age'] = pd.NA
+    return df
+
+
+@pytest.fixture(scope='module')
+def index(squads):
+    return FilterIndex(squads)
+
+
+def assert_same(index, df, values=None, ranges=None):
+    rows = index.query(values, ranges)
+    np.testing.assert_array_equal(rows, mask_chain(df, values, ranges))
+    return rows
+
+
+def test_no_filters_match_every_row(index, squads):
+    assert len(assert_same(index, squads)) == len(squads)
+
+
+def test_missing_values_never_match(index, squads):
+    positions = sorted(squads['Position'].dropna().unique())
+    rows = assert_same(index, squads, {'Position': positions}, {'Caps': (0, 1000), 'Age': (0, 200)})
+    assert not set(rows) & {0, 30, 1, 31, 60, 2, 61}
+
+
+def test_values_not_in_the_index(index, squads):
+    assert len(assert_same(index, squads, {'Position': ['ST']})) == 0
+    assert_same(index, squads, {'Position': ['GK', 'ST']})
+
+
+def test_empty_allowed_list_is_no_filter(index, squads):
+    rows = assert_same(index, squads, {'Position': []}, {'Goals': (0, 5)})
+    np.testing.assert_array_equal(rows, index.query(ranges={'Goals': (0, 5)}))
+
+
+@pytest.mark.parametrize('low, high', [(10, 5), (-50, -1), (500, 1000), (-1000, 1000), (2.5, 7.5), (7, 7)])
+def test_bounds(index, squads, low, high):
+    for col in ('Caps', 'Goals', 'Age'):
+        assert_same(index, squads, ranges={col: (low, high)})
+
+
+def test_unknown_columns_are_ignored(index, squads):
+    rows = index.query({'Club': ['Morocco Club 1']}, {'Number': (1, 2)})
+    assert len(rows) == len(squads)
+
+
+def test_random_filter_combinations(index, squads):
+    rng = np.random.default_rng(0)
+    positions = ['GK', 'DF', 'MF', 'FW', 'ST']
+    for _ in range(300):
+        values = {'Position': list(rng.choice(positions, rng.integers(0, 4), replace=False))}
+        ranges = {}
+        for col, top in (('Caps', 95), ('Goals', 35), ('Age', 40)):
+            if rng.random() < 0.7:
+                low, high = sorted(rng.integers(-5, top, 2))
+                ranges[col] = (int(low), int(high))
+        assert_same(index, squads, values, ranges)
@@ -0,0 +1,82 @@
+# test_fixture_store.py
+import pytest
+import requests
+
+import scraper
+from fixture_store import FIXTURE_DIR_ENV, FIXTURE_MODE_ENV, FixtureNotFoundError, FixtureStore
+from http_cache import HttpCache
+
+MOROCCO = 'Morocco_national_football_team'
+
+
+def record(stub_server, session, fixture_dir):
+    url = stub_server.url(MOROCCO)
+    df = scraper.scrape_team_table(url, session=session, fixtures=FixtureStore(fixture_dir, 'record'))
+    stub_server.shutdown()
+    stub_server.server_close()
+    return url, df
+
+
+def test_replay_after_server_is_gone(stub_server, fast_session, tmp_path):
+    url, recorded = record(stub_server, fast_session, str(tmp_path))
+
+    replayed = scraper.scrape_team_table(url, session=fast_session, fixtures=FixtureStore(str(tmp_path), 'replay'))
+
+    assert replayed.equals(recorded)
+    with pytest.raises(requests.ConnectionError):
+        fast_session.get(url)
+
+
+def test_replayed_response_keeps_status_and_headers(stub_server, fast_session, tmp_path):
+    url, _ = record(stub_server, fast_session, str(tmp_path))
+
+    response = FixtureStore(str(tmp_path)).load(url)
+
+    assert response.status_code == 200
+    assert response.headers['ETag']
+    assert 'Content-Length' not in response.headers
+    assert response.content.startswith(b'<!DOCTYPE html>')
+
+
+def test_replay_fills_the_http_cache(stub_server, fast_session, tmp_path):
+    url, _ = record(stub_server, fast_session, str(tmp_path / 'fixtures'))
+    cache = HttpCache(str(tmp_path / 'cache'))
+
+    scraper.scrape_team_table(url, cache, fixtures=FixtureStore(str(tmp_path / 'fixtures'), 'replay'))
+
+    assert cache.stats == {'hits': 0, 'misses': 1, 'not_modified': 0}
+    assert cache.load(url) is not None
+
+
+def test_missing_fixture_raises(tmp_path):
+    store = FixtureStore(str(tmp_path), 'replay')
+    with pytest.raises(FixtureNotFoundError):
+        scraper.scrape_team_table('https://example.invalid/wiki/Nowhere', fixtures=store)
+    assert issubclass(FixtureNotFoundError, LookupError)
+
+
+def test_environment_selects_the_store(stub_server, fast_session, tmp_path, monkeypatch):
+    monkeypatch.setenv(FIXTURE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(FIXTURE_MODE_ENV, 'record')
+    url = stub_server.url(MOROCCO)
+    recorded = scraper.scrape_team_table(url, session=fast_session)
+    stub_server.shutdown()
+    stub_server.server_close()
+
+    monkeypatch.setenv(FIXTURE_MODE_ENV, ' Replay ')
+    store = FixtureStore.from_env()
+    assert (store.fixture_dir, store.mode) == (str(tmp_path), 'replay')
+    assert scraper.scrape_team_table(url, session=fast_session).equals(recorded)
+
+
+@pytest.mark.parametrize('mode', [None, '', 'off', 'OFF'])
+def test_environment_off(monkeypatch, mode):
+    if mode is not None:
+        monkeypatch.setenv(FIXTURE_MODE_ENV, mode)
+    assert FixtureStore.from_env() is None
+
+
+def test_unknown_mode(monkeypatch):
+    monkeypatch.setenv(FIXTURE_MODE_ENV, 'playback')
+    with pytest.raises(ValueError):
+        FixtureStore.from_env()
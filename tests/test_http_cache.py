@@ -0,0 +1,75 @@
+# test_http_cache.py
+import datetime
+import json
+
+import pytest
+
+import scraper
+from http_cache import HttpCache
+
+MOROCCO = 'Morocco_national_football_team'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(str(tmp_path / 'cache'))
+
+
+def frozen_today(monkeypatch, day):
+    class FrozenDate(datetime.date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(scraper, 'date', FrozenDate)
+
+
+def test_not_modified_rebuilds_derived_columns(stub_server, fast_session, cache, monkeypatch):
+    url = stub_server.url(MOROCCO)
+    frozen_today(monkeypatch, datetime.date(2026, 1, 1))
+    first = scraper.scrape_team_table(url, cache, session=fast_session)
+
+    frozen_today(monkeypatch, datetime.date(2027, 1, 1))
+    second = scraper.scrape_team_table(url, cache, session=fast_session)
+
+    assert cache.stats['hits'] == 1
+    assert (second['Age'] - first['Age']).dropna().eq(1).all()
+    assert (second['Age_Days'] - first['Age_Days']).dropna().eq(365).all()
+    assert second['Player'].equals(first['Player'])
+
+
+def test_cached_rows_get_current_schema(stub_server, fast_session, cache):
+    url = stub_server.url(MOROCCO)
+    fresh = scraper.scrape_team_table(url, cache, session=fast_session)
+    cached = scraper.scrape_team_table(url, cache, session=fast_session)
+
+    assert cache.stats['hits'] == 1
+    assert cached.dtypes.equals(fresh.dtypes)
+    assert cached.equals(fresh)
+
+
+def test_rows_from_other_version_are_reparsed(stub_server, fast_session, cache):
+    url = stub_server.url(MOROCCO)
+    fresh = scraper.scrape_team_table(url, cache, session=fast_session)
+
+    path = cache._path(url, '.rows.json')
+    with open(path) as f:
+        parsed = json.load(f)
+    parsed['version'] = scraper.PARSED_CACHE_VERSION - 1
+    parsed['rows'] = []
+    with open(path, 'w') as f:
+        json.dump(parsed, f)
+
+    again = scraper.scrape_team_table(url, cache, session=fast_session)
+    assert cache.stats == {'hits': 0, 'misses': 1, 'not_modified': 1}
+    assert again.equals(fresh)
+    assert cache.load_parsed(url, version=scraper.PARSED_CACHE_VERSION) is not None
+
+
+def test_legacy_pickle_is_ignored(stub_server, fast_session, cache):
+    url = stub_server.url(MOROCCO)
+    fresh = scraper.scrape_team_table(url, cache, session=fast_session)
+    cache._remove(url, '.rows.json')
+    fresh.head(1).to_pickle(cache._path(url, '.pkl'))
+
+    again = scraper.scrape_team_table(url, cache, session=fast_session)
+    assert again.equals(fresh)
@@ -0,0 +1,64 @@
+# test_leaderboard.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import TEAMS, make_squads
+from leaderboard import Leaderboard, top_k, top_k_positions
+
+
+@pytest.fixture
+def squads():
+    return make_squads(rows_per_team=12, seed=0)
+
+
+def players(result):
+    """Player lists of a top() / top_k() result, ignoring the index"""
+    if isinstance(result, pd.DataFrame):
+        return result['Player'].tolist()
+    return {name: players(value) for name, value in result.items()}
+
+
+def assert_matches_full_recompute(leaderboard, df):
+    assert players(leaderboard.top()) == players(top_k(df, k=leaderboard.k))
+    for by in ('Position', 'Club', 'Team'):
+        assert players(leaderboard.top(by)) == players(top_k(df, k=leaderboard.k, by=by))
+
+
+def test_top_k_positions_breaks_ties_by_row():
+    scores = np.array([1.0, 3.0, 3.0, np.nan, 3.0, 2.0])
+    assert top_k_positions(scores, 2).tolist() == [1, 2]
+    assert top_k_positions(scores, 4).tolist() == [1, 2, 4, 5]
+
+
+def test_updates_in_any_order_match_full_recompute(squads):
+    leaderboard = Leaderboard(k=3)
+    leaderboard.update(squads)
+    assert_matches_full_recompute(leaderboard, squads)
+
+    # Re-updating teams, or removing and re-adding one, keeps its place
+    for team in ('F', 'A'):
+        leaderboard.update_team(team, squads[squads['Team'] == team])
+    leaderboard.remove_team('C')
+    leaderboard.update_team('C', squads[squads['Team'] == 'C'])
+    assert_matches_full_recompute(leaderboard, squads)
+
+
+def test_team_order_decides_ties_for_per_team_updates(squads):
+    leaderboard = Leaderboard(k=3, team_order=TEAMS)
+    for team in reversed(TEAMS):
+        leaderboard.update_team(team, squads[squads['Team'] == team].drop(columns='Team'))
+    assert_matches_full_recompute(leaderboard, squads)
+
+
+def test_changed_team_rows(squads):
+    leaderboard = Leaderboard(k=3)
+    leaderboard.update(squads)
+
+    changed = squads.copy()
+    changed.loc[changed['Team'] == 'D', 'Goals'] = 2
+    leaderboard.update_team('D', changed[changed['Team'] == 'D'])
+    assert_matches_full_recompute(leaderboard, changed)
+
+    leaderboard.remove_team('D')
+    assert_matches_full_recompute(leaderboard, changed[changed['Team'] != 'D'])
@@ -0,0 +1,100 @@
+# test_name_index.py
+import pytest
+
+from name_index import NameIndex, normalize_name
+
+NAMES = [
+    'Achraf Ḥakimi',        # 0
+    'Hakim Ziyech',         # 1
+    'Romain Saïss',         # 2
+    'Yassine Bounou',       # 3
+    'Noussair Mazraoui',    # 4
+    'أشرف حكيمي',           # 5
+    'حمزة',                 # 6
+    None,                   # 7
+    'Brahim Díaz',          # 8
+]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return NameIndex(NAMES)
+
+
+def names(rows):
+    return [NAMES[row] for row in rows]
+
+
+@pytest.mark.parametrize('raw, folded', [
+    ('Ḥakimi', 'hakimi'),
+    ('  Romain  SAÏSS ', 'romain saiss'),
+    ('En-Nesyri', 'en nesyri'),
+    ('Ødegaard', 'odegaard'),
+    ('حمزة', 'حمزه'),
+    ('مصطفى', 'مصطفي'),
+    ('محـــمد', 'محمد'),
+    ('ٱلله', 'الله'),
+])
+def test_normalize_name_folds_variants(raw, folded):
+    assert normalize_name(raw) == folded
+
+
+def test_accent_free_query_finds_accented_name(index):
+    assert names(index.substring('hakimi')) == ['Achraf Ḥakimi']
+    assert names(index.substring('SAISS')) == ['Romain Saïss']
+    assert names(index.substring('diaz')) == ['Brahim Díaz']
+
+
+def test_arabic_variants_match_each_other(index):
+    # Ta marbuta typed as ha, and a tatweel-stretched spelling
+    assert names(index.substring('حمزه')) == ['حمزة']
+    assert names(index.substring('حكـــيمي')) == ['أشرف حكيمي']
+
+
+def test_prefix_only_matches_word_starts(index):
+    assert names(index.prefix('hak')) == ['Achraf Ḥakimi', 'Hakim Ziyech']
+    assert names(index.prefix('kim')) == []
+    assert names(index.substring('kim')) == ['Achraf Ḥakimi', 'Hakim Ziyech']
+
+
+@pytest.mark.parametrize('query', ['a', 'ou', 'Ḥ', 'z ', 'ss'])
+def test_short_queries_match_like_a_scan(index, query):
+    folded = normalize_name(query)
+    expected = [row for row, name in enumerate(NAMES) if isinstance(name, str) and folded in normalize_name(name)]
+    assert list(index.substring(query)) == expected
+
+
+def test_short_prefix_query(index):
+    assert names(index.prefix('b')) == ['Yassine Bounou', 'Brahim Díaz']
+
+
+def test_empty_query_matches_every_row(index):
+    assert list(index.substring('')) == list(range(len(NAMES)))
+    assert list(index.search('  ')) == list(range(len(NAMES)))
+
+
+def test_missing_names_never_match(index):
+    assert 7 not in index.substring('none')
+    assert 7 not in [row for row, _ in index.fuzzy('None')]
+
+
+def test_fuzzy_ranks_the_closest_name_first(index):
+    matches = index.fuzzy('achraf hakimy')
+    assert NAMES[matches[0][0]] == 'Achraf Ḥakimi'
+    similarities = [similarity for _, similarity in matches]
+    assert similarities == sorted(similarities, reverse=True)
+    assert all(similarity >= 0.5 for similarity in similarities)
+
+
+def test_fuzzy_ties_go_to_the_shorter_name(index):
+    # "hakimy" shares four of its six trigrams with both names
+    (first, first_score), (second, second_score) = index.fuzzy('hakimy')[:2]
+    assert first_score == second_score
+    assert [NAMES[first], NAMES[second]] == ['Hakim Ziyech', 'Achraf Ḥakimi']
+
+
+def test_search_falls_back_to_fuzzy_on_a_typo(index):
+    assert not len(index.substring('mazrawi'))
+    assert names(index.search('mazrawi'))[0] == 'Noussair Mazraoui'
+    assert names(index.search('Bounou')) == ['Yassine Bounou']
+    assert list(index.search('xyzzy')) == []
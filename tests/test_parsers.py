@@ -0,0 +1,47 @@
+# test_parsers.py
+import pytest
+
+from conftest import read_page
+from scraper import PARSE_MODES, available_parsers, parse_players_table
+
+PAGES = {
+    'Morocco_national_football_team': 26,  # <div class="mw-heading"> headings, header row in <tbody>
+    'Senegal_national_football_team': 24,  # old <span class="mw-headline"> headings, no <tbody>
+    'Egypt_national_football_team': 23,    # no players heading, captioned table, text dates
+    'Tunisia_national_football_team': 26,  # no <meta charset>
+}
+
+
+@pytest.fixture(scope='module')
+def references():
+    return {title: parse_players_table(read_page(title), 'full', 'html.parser') for title in PAGES}
+
+
+@pytest.mark.parametrize('parse_mode', PARSE_MODES)
+@pytest.mark.parametrize('parser', available_parsers())
+@pytest.mark.parametrize('title', list(PAGES))
+def test_every_backend_gives_the_same_frame(title, parser, parse_mode, references):
+    df = parse_players_table(read_page(title), parse_mode, parser)
+    assert df.equals(references[title])
+
+
+@pytest.mark.parametrize('title, players', PAGES.items())
+def test_reference_frame(title, players, references):
+    df = references[title]
+    assert len(df) == players
+    assert 'Player' not in set(df['Player'])
+    assert df['Number'].notna().all()
+    assert df['Birth_Date'].notna().all()
+
+
+@pytest.mark.parametrize('parse_mode', PARSE_MODES)
+@pytest.mark.parametrize('parser', available_parsers())
+def test_page_without_charset_decodes_as_utf8(parser, parse_mode):
+    content = read_page('Tunisia_national_football_team')
+    assert b'charset' not in content.lower()
+
+    players = parse_players_table(content, parse_mode, parser)['Player']
+    assert 'Ayoub Saïss' in players.str.strip().tolist()
+    assert 'Selim Díaz (captain)' in players.tolist()
+    assert 'أشرف حكيمي' in players.tolist()
+    assert not players.str.contains('Ã|Ø', regex=True).any()
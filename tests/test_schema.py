@@ -0,0 +1,54 @@
+# test_schema.py
+import pandas as pd
+import pytest
+
+import scraper
+from conftest import read_page
+
+MOROCCO = 'Morocco_national_football_team'
+SENEGAL = 'Senegal_national_football_team'
+
+SQUAD_DTYPES = {
+    'Number': 'Int8',
+    'Position': 'category',
+    'Player': 'object',
+    'Date_of_Birth': 'object',
+    'Caps': 'Int16',
+    'Goals': 'Int16',
+    'Club': 'category',
+    'Birth_Date': 'datetime64[ns]',
+    'Birth_Year': 'Int16',
+    'Age': 'Int8',
+    'Age_Days': 'Int32',
+    'Goal_Ratio': 'float32',
+}
+
+
+def dtypes(df):
+    return {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+
+@pytest.mark.parametrize('parser', scraper.available_parsers())
+def test_parsed_frame_dtypes(parser):
+    df = scraper.parse_players_table(read_page(MOROCCO), parser=parser)
+    assert dtypes(df) == SQUAD_DTYPES
+    # The row with "—" caps keeps its place as <NA>
+    assert df['Caps'].isna().sum() == 1
+
+
+def test_combined_frame_dtypes(stub_server, fast_session):
+    df, failures = scraper.scrape_team_tables(
+        [stub_server.url(MOROCCO), stub_server.url(SENEGAL)], session=fast_session)
+
+    assert failures == {}
+    assert dtypes(df) == {'Team': 'category', **SQUAD_DTYPES}
+    # Categories are the union of both teams', not object after concat
+    assert set(df['Team'].cat.categories) == {'Morocco', 'Senegal'}
+    assert set(df['Club'].cat.categories) == set(df['Club'].astype(str))
+
+
+def test_apply_schema_nulls_values_out_of_range():
+    df = scraper.apply_schema(pd.DataFrame({'Number': [1, 300, 2.5, None], 'Age': ['30', 'x', '-5', '200']}))
+    assert dtypes(df) == {'Number': 'Int8', 'Age': 'Int8'}
+    assert df['Number'].tolist() == [1, pd.NA, pd.NA, pd.NA]
+    assert df['Age'].tolist() == [30, pd.NA, -5, pd.NA]
@@ -0,0 +1,54 @@
+# test_scrape_team_tables.py
+import scraper
+from conftest import read_page
+from http_cache import HttpCache
+
+MOROCCO = 'Morocco_national_football_team'
+SENEGAL = 'Senegal_national_football_team'
+
+
+def test_combined_frame_has_team_column(stub_server, fast_session):
+    df, failures = scraper.scrape_team_tables(
+        [stub_server.url(MOROCCO), stub_server.url(SENEGAL)], session=fast_session)
+
+    assert failures == {}
+    assert list(df.columns[:2]) == ['Team', 'Number']
+    morocco = scraper.parse_players_table(read_page(MOROCCO))
+    senegal = scraper.parse_players_table(read_page(SENEGAL))
+    assert df['Team'].value_counts().to_dict() == {'Morocco': len(morocco), 'Senegal': len(senegal)}
+    assert list(df['Player']) == list(morocco['Player']) + list(senegal['Player'])
+
+
+def test_failures_are_reported_per_team(stub_server, fast_session, closed_port_url):
+    missing = stub_server.url('Atlantis_national_football_team')
+    df, failures = scraper.scrape_team_tables(
+        [stub_server.url(MOROCCO), missing, closed_port_url], session=fast_session)
+
+    assert set(df['Team'].unique()) == {'Morocco'}
+    assert set(failures) == {missing, closed_port_url}
+    assert '404' in failures[missing]
+    assert failures[closed_port_url]
+
+
+def test_title_and_url_are_one_team(stub_server, fast_session, monkeypatch):
+    monkeypatch.setattr(scraper, 'WIKIPEDIA_BASE_URL', stub_server.base_url)
+
+    df, failures = scraper.scrape_team_tables(
+        [MOROCCO, stub_server.url(MOROCCO), 'Morocco national football team'], session=fast_session)
+
+    assert failures == {}
+    assert stub_server.requests == ['/wiki/' + MOROCCO]
+    assert df['Team'].unique().tolist() == ['Morocco']
+
+
+def test_cache_counters_across_revalidation(stub_server, fast_session, tmp_path):
+    cache = HttpCache(str(tmp_path / 'cache'))
+    teams = [stub_server.url(MOROCCO), stub_server.url(SENEGAL)]
+
+    first, _ = scraper.scrape_team_tables(teams, cache=cache, session=fast_session)
+    assert cache.stats == {'hits': 0, 'misses': 2, 'not_modified': 0}
+
+    second, _ = scraper.scrape_team_tables(teams, cache=cache, session=fast_session)
+    assert cache.stats == {'hits': 2, 'misses': 2, 'not_modified': 2}
+    assert second.equals(first)
+
@@ -0,0 +1,88 @@
+# test_session.py
+import time
+
+import pytest
+import requests
+
+import scraper
+
+MOROCCO = 'Morocco_national_football_team'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting"""
+    calls = []
+    monkeypatch.setattr(scraper.time, 'sleep', calls.append)
+    return calls
+
+
+def make_session(**kwargs):
+    kwargs.setdefault('timeout', 2)
+    kwargs.setdefault('backoff_factor', 0.001)
+    return scraper.create_session(**kwargs)
+
+
+def test_retries_until_success(stub_server):
+    stub_server.configure(fail_first=2)
+    with make_session(max_retries=3) as session:
+        response = session.get(stub_server.url(MOROCCO))
+
+    assert response.status_code == 200
+    assert len(stub_server.requests) == 3
+
+
+def test_returns_last_response_when_retries_run_out(stub_server):
+    stub_server.configure(fail_first=10, fail_status=502)
+    with make_session(max_retries=2) as session:
+        response = session.get(stub_server.url(MOROCCO))
+
+    assert response.status_code == 502
+    assert len(stub_server.requests) == 3
+
+
+def test_connection_errors_are_retried_then_raised(closed_port_url, sleeps):
+    with make_session(max_retries=2) as session:
+        with pytest.raises(requests.ConnectionError):
+            session.get(closed_port_url)
+    assert len(sleeps) == 2
+
+
+def test_timeout_is_honoured(stub_server):
+    stub_server.configure(delay=1.0)
+    start = time.perf_counter()
+    with make_session(timeout=0.2, max_retries=1) as session:
+        with pytest.raises(requests.Timeout):
+            session.get(stub_server.url(MOROCCO))
+
+    assert time.perf_counter() - start < 1.0
+    assert len(stub_server.requests) == 2
+
+
+def test_backoff_is_capped():
+    session = make_session(backoff_factor=100)
+    assert all(0 <= session.backoff_delay(attempt) <= scraper.MAX_BACKOFF for attempt in range(10))
+
+
+@pytest.mark.parametrize('retry_after, expected', [('2', 2), ('3600', scraper.MAX_BACKOFF)])
+def test_retry_after_is_honoured_on_429(stub_server, sleeps, retry_after, expected):
+    stub_server.configure(fail_first=1, fail_status=429, fail_headers={'Retry-After': retry_after})
+    with make_session(max_retries=3) as session:
+        response = session.get(stub_server.url(MOROCCO))
+
+    assert response.status_code == 200
+    assert sleeps == [expected]
+
+
+def make_response(status_code, retry_after):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers['Retry-After'] = retry_after
+    return response
+
+
+def test_retry_after_delay_forms():
+    assert scraper.retry_after_delay(make_response(503, '5')) == 5
+    assert scraper.retry_after_delay(make_response(429, 'Wed, 21 Oct 2015 07:28:00 GMT')) == 0
+    assert scraper.retry_after_delay(make_response(429, 'soon')) is None
+    assert scraper.retry_after_delay(make_response(500, '5')) is None
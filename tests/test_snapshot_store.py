@@ -0,0 +1,119 @@
+# test_snapshot_store.py
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+import requests
+
+import scraper
+import snapshot_store
+from conftest import ROOT, read_page
+from fixture_store import FIXTURE_DIR_ENV, FIXTURE_MODE_ENV, FixtureStore
+from snapshot_store import SnapshotStore
+
+SAVES_PER_PROCESS = 10
+
+
+def squad(team, players=3):
+    return pd.DataFrame({
+        'Team': team,
+        'Player': [f"{team} {i}" for i in range(players)],
+        'Caps': pd.array(range(players), dtype='Int16'),
+    })
+
+
+def save_many(root, team, barrier):
+    store = SnapshotStore(root)
+    barrier.wait()
+    for _ in range(SAVES_PER_PROCESS):
+        store.save(squad(team), team)
+
+
+def test_save_and_load_latest(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    start = datetime(2026, 10, 1, 12, 0)
+    for day in range(3):
+        store.save(squad('Morocco', players=day + 1), 'Morocco', start + timedelta(days=day))
+    store.save(squad('Senegal'), 'Senegal', start)
+
+    assert len(store.snapshots()) == 4
+    assert len(store.load_latest('Morocco')) == 3
+    assert store.load_latest('Morocco')['Caps'].dtype == 'Int16'
+    assert len(store.load_range('2026-10-01', '2026-10-02', team='Morocco')) == 1 + 2
+
+
+@pytest.mark.skipif(snapshot_store.fcntl is None, reason='needs fcntl file locks')
+def test_concurrent_processes_keep_every_entry(tmp_path):
+    context = multiprocessing.get_context('fork')
+    teams = ['Morocco', 'Senegal', 'Egypt', 'Tunisia']
+    barrier = context.Barrier(len(teams))
+    processes = [context.Process(target=save_many, args=(str(tmp_path), team, barrier)) for team in teams]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    store = SnapshotStore(str(tmp_path))
+    entries = store.snapshots()
+    assert len(entries) == len(teams) * SAVES_PER_PROCESS
+    assert len({entry['path'] for entry in entries}) == len(entries)
+    assert sorted(entries, key=lambda entry: entry['path']) == sorted(
+        store.rebuild_manifest(), key=lambda entry: entry['path'])
+
+
+@pytest.mark.parametrize('corruption', ['{"snapshots": [', 'not json', '{}', '{"snapshots": 3}'])
+def test_corrupt_manifest_is_rebuilt(tmp_path, corruption):
+    store = SnapshotStore(str(tmp_path))
+    first = store.save(squad('Morocco'), 'Morocco', datetime(2026, 10, 1, 12, 0))
+    with open(store.manifest_path, 'w') as f:
+        f.write(corruption)
+
+    assert [entry['path'] for entry in store.snapshots()] == [first['path']]
+    with open(store.manifest_path) as f:
+        assert len(json.load(f)['snapshots']) == 1
+
+    with open(store.manifest_path, 'w') as f:
+        f.write(corruption)
+    second = store.save(squad('Morocco'), 'Morocco', datetime(2026, 10, 2, 12, 0))
+    assert [entry['path'] for entry in store.snapshots()] == [first['path'], second['path']]
+
+
+def test_scraper_script_saves_a_snapshot(tmp_path):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = read_page('Morocco_national_football_team')
+    FixtureStore(str(tmp_path / 'fixtures'), 'record').save(scraper.MOROCCO_TEAM_URL, response)
+
+    env = dict(os.environ, **{FIXTURE_MODE_ENV: 'replay', FIXTURE_DIR_ENV: str(tmp_path / 'fixtures')})
+    subprocess.run([sys.executable, os.path.join(ROOT, 'scraper.py')], cwd=tmp_path, env=env,
+                   check=True, capture_output=True)
+
+    entries = SnapshotStore(str(tmp_path / 'snapshots')).snapshots(scraper.MOROCCO_TEAM)
+    assert [entry['rows'] for entry in entries] == [26]
+    assert not (tmp_path / 'morocco_football_team.csv').exists()
+
+
+def test_load_latest_skips_unreadable_files(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    start = datetime(2026, 10, 1, 12, 0)
+    oldest = store.save(squad('Morocco', players=1), 'Morocco', start)
+    corrupt = store.save(squad('Morocco', players=2), 'Morocco', start + timedelta(days=1))
+    missing = store.save(squad('Morocco', players=3), 'Morocco', start + timedelta(days=2))
+    with open(os.path.join(str(tmp_path), corrupt['path']), 'wb') as f:
+        f.write(b'PAR1 truncated')
+    os.remove(os.path.join(str(tmp_path), missing['path']))
+
+    entry, df = store.load_latest_entry('Morocco')
+    assert entry == oldest
+    assert len(df) == 1
+    assert len(store.load_latest('Morocco')) == 1
+
+    os.remove(os.path.join(str(tmp_path), oldest['path']))
+    assert store.load_latest_entry('Morocco') is None
+    assert store.load_latest('Morocco') is None
@@ -0,0 +1,62 @@
+# test_squad_stats.py
+import pytest
+
+from conftest import TEAMS, make_squads
+from scraper import get_summary_stats
+from squad_stats import SquadStats, TeamStats, stats_by_group
+
+
+@pytest.fixture
+def squads():
+    return make_squads(rows_per_team=15, seed=1)
+
+
+def team_rows(df, team):
+    return df[df['Team'] == team]
+
+
+def test_team_stats_match_one_pass_after_updates(squads):
+    stats = TeamStats()
+    stats.update(squads)
+    assert stats.total().to_dict() == get_summary_stats(squads)
+
+    for team in ('F', 'C'):
+        stats.update_team(team, team_rows(squads, team))
+    stats.remove_team('A')
+    stats.update_team('A', team_rows(squads, 'A'))
+    assert stats.total().to_dict() == get_summary_stats(squads)
+
+
+def test_team_order_decides_ties_for_per_team_updates(squads):
+    stats = TeamStats(team_order=TEAMS)
+    for team in reversed(TEAMS):
+        stats.update_team(team, team_rows(squads, team))
+    assert stats.total().to_dict() == get_summary_stats(squads)
+
+
+def test_merge_is_order_independent(squads):
+    states = [SquadStats.from_frame(team_rows(squads, team), rank) for rank, team in enumerate(TEAMS)]
+    forward = sum(states, SquadStats())
+    backward = sum(reversed(states), SquadStats())
+    pairs = (states[0] + states[3]) + (states[5] + (states[1] + states[2] + states[4]))
+
+    expected = get_summary_stats(squads)
+    assert forward.to_dict() == backward.to_dict() == pairs.to_dict() == expected
+
+
+def test_removed_team_leaves_the_total(squads):
+    stats = TeamStats()
+    stats.update(squads)
+    stats.remove_team('B')
+    assert stats.total().to_dict() == get_summary_stats(squads[squads['Team'] != 'B'].reset_index(drop=True))
+
+
+def test_stats_by_group_matches_per_team_summaries(squads):
+    by_team = stats_by_group(squads)
+    for team in TEAMS:
+        summary = get_summary_stats(team_rows(squads, team))
+        row = by_team.loc[team]
+        assert row['players'] == summary['total_players']
+        assert row['total_goals'] == summary['total_goals']
+        assert row['top_scorer'] == summary['top_scorer']['name']
+        assert row['most_experienced'] == summary['most_experienced']['name']
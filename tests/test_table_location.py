@@ -0,0 +1,67 @@
+# test_table_location.py
+import pytest
+
+import scraper
+from conftest import read_page
+from scraper import available_parsers, parse_players_table, rank_tables, score_table
+
+EGYPT = 'Egypt_national_football_team'
+URL = 'https://en.wikipedia.org/wiki/' + EGYPT
+SQUAD_HEADERS = ['No.', 'Pos.', 'Player', 'Date of birth (age)', 'Caps', 'Goals', 'Club']
+
+
+def test_score_table():
+    assert score_table(['wikitable'], 'Results', ['Year', 'Result']) == 0
+    plain = score_table([], '', SQUAD_HEADERS)
+    assert plain == sum(scraper.SQUAD_HEADER_WEIGHTS.values())
+    assert score_table(['wikitable'], '', SQUAD_HEADERS) == plain + 1
+    assert score_table(['wikitable'], 'Current squad', SQUAD_HEADERS) == plain + 3
+
+
+def test_rank_tables_best_first_ties_in_page_order():
+    features = [
+        (['wikitable'], '', ['Year', 'Result']),
+        (['wikitable'], 'Most capped players', ['Rank', 'Player', 'Caps', 'Goals']),
+        ([], '', SQUAD_HEADERS),
+        ([], '', SQUAD_HEADERS),
+    ]
+    assert [index for _, index in rank_tables(features)] == [2, 3, 1]
+    assert rank_tables(features[:1]) == []
+
+
+@pytest.mark.parametrize('parser', available_parsers())
+def test_ranking_picks_the_captioned_squad_table(parser):
+    # No heading mentions players, and a "Most capped players" table
+    # follows, so only the ranking can find the squad
+    df = parse_players_table(read_page(EGYPT), 'full', parser)
+    assert len(df) == 23
+    assert not df['Player'].str.startswith('Former Player').any()
+    assert df['Birth_Date'].notna().all()
+
+
+@pytest.mark.parametrize('parser', available_parsers())
+def test_remembered_signature_skips_the_search(parser, monkeypatch):
+    content = read_page(EGYPT)
+    first = parse_players_table(content, 'full', parser, url=URL)
+    signature = scraper._table_signatures[(URL, 'full', parser)]
+    assert signature['headers'] == tuple(SQUAD_HEADERS)
+
+    def no_search(features):
+        raise AssertionError('table search ran again')
+    monkeypatch.setattr(scraper, 'rank_tables', no_search)
+
+    assert parse_players_table(content, 'full', parser, url=URL).equals(first)
+
+
+@pytest.mark.parametrize('parser', available_parsers())
+def test_stale_signature_falls_back_to_the_search(parser):
+    content = read_page(EGYPT)
+    expected = parse_players_table(content, 'full', parser, url=URL)
+    index = scraper._table_signatures[(URL, 'full', parser)]['index']
+
+    # A new table before the squad moves it one position down
+    extra = b'<table class="wikitable"><tr><th>Kit</th><th>Supplier</th></tr></table>'
+    changed = content.replace(b'<div class="mw-parser-output">', b'<div class="mw-parser-output">' + extra, 1)
+
+    assert parse_players_table(changed, 'full', parser, url=URL).equals(expected)
+    assert scraper._table_signatures[(URL, 'full', parser)]['index'] == index + 1